@@ -0,0 +1,54 @@
+# benchmarks\bench_hibp_parse.py
+"""
+Micro-benchmark of HIBP range-response parsing.
+
+Compares the original line-splitting parser with `suffix_in_range`, on a
+padded response of about 1000 lines, for a suffix that is present and one
+that is not (the common case).
+
+    python benchmarks/bench_hibp_parse.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from hibp import suffix_in_range  # noqa: E402
+
+
+def legacy_suffix_in_range(text: str, suffix: str) -> bool:
+    """The parser hibp_validator used before it searched the raw bytes."""
+    lines = text.splitlines()
+    return any(
+        line.split(":")[0].strip() == suffix and int(line.split(":")[1].strip()) > 0
+        for line in lines
+    )
+
+
+def make_response(lines: int, seed: int = 0) -> tuple[str, str]:
+    rng = random.Random(seed)
+    suffixes = sorted("".join(rng.choice("0123456789ABCDEF") for _ in range(35)) for _ in range(lines))
+    # Roughly a fifth of a padded response is padding with a count of 0
+    body = "\r\n".join(f"{suffix}:{0 if rng.random() < 0.2 else rng.randint(1, 5000)}" for suffix in suffixes)
+    present = next(line.split(":")[0] for line in body.splitlines()[lines // 2:] if not line.endswith(":0"))
+    return body, present
+
+
+def main(number: int = 2000) -> None:
+    text, present = make_response(1000)
+    body = text.encode("ascii")
+    absent = "F" * 35
+
+    print(f"{'case':<10}{'parser':<10}{'us/lookup':>12}")
+    for case, suffix in (("present", present), ("absent", absent)):
+        assert legacy_suffix_in_range(text, suffix) == suffix_in_range(body, suffix)
+        legacy = timeit.timeit(lambda: legacy_suffix_in_range(text, suffix), number=number) / number
+        current = timeit.timeit(lambda: suffix_in_range(body, suffix), number=number) / number
+        print(f"{case:<10}{'legacy':<10}{legacy * 1e6:>12.2f}")
+        print(f"{case:<10}{'bytes':<10}{current * 1e6:>12.2f}   ({legacy / current:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
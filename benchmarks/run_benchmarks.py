@@ -0,0 +1,230 @@
+# benchmarks\run_benchmarks.py
+"""
+Benchmark suite for the Levenshtein, blocklist and HIBP paths.
+
+Every case is timed call by call and reports throughput, p50/p99 latency
+and the peak memory traced while it ran (measured in a separate pass, so
+tracing does not skew the timings). Inputs come from a seeded generator,
+so runs are reproducible.
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --sizes 1000,100000,1000000 --output bench.json
+    python benchmarks/run_benchmarks.py --baseline bench.json --threshold 1.25
+
+With --baseline, the p50 of every case is compared against the stored run
+and the exit status is 1 when any case got slower than the threshold
+allows, so CI can fail on regressions.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import string
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blocklist_validator import blocklist_validator  # noqa: E402
+from compiled_blocklist import CompiledBlocklist  # noqa: E402
+from hibp import HIBPClient, generate_sha1, suffix_in_range  # noqa: E402
+from utils.levenshtein_distance import levenshtein_distance  # noqa: E402
+
+PASSWORD_LENGTHS = (8, 16, 32)
+ALPHABET = string.ascii_lowercase + string.digits
+
+
+def random_word(rng: random.Random, length: int) -> str:
+    return "".join(rng.choice(ALPHABET) for _ in range(length))
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def measure(name: str, run: Callable[[], object], iterations: int, warmup: int = 3, **params) -> dict:
+    """Times `iterations` calls of `run`, then traces the peak memory of a few more."""
+    for _ in range(warmup):
+        run()
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+
+    tracemalloc.start()
+    for _ in range(min(iterations, 3)):
+        run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "name": name,
+        "params": params,
+        "iterations": iterations,
+        "opsPerSecond": iterations / sum(timings),
+        "p50Ms": percentile(timings, 0.50) * 1e3,
+        "p99Ms": percentile(timings, 0.99) * 1e3,
+        "peakMemoryBytes": peak,
+    }
+
+
+def bench_levenshtein(rng: random.Random, iterations: int) -> list[dict]:
+    results = []
+    for length in PASSWORD_LENGTHS:
+        a, b = random_word(rng, length), random_word(rng, length)
+        results.append(measure(f"levenshtein_distance/{length}", lambda: levenshtein_distance(a, b),
+                               iterations, length=length))
+    return results
+
+
+def bench_blocklist(rng: random.Random, sizes: list[int], iterations: int) -> list[dict]:
+    results = []
+    for size in sizes:
+        terms = [random_word(rng, rng.randint(4, 12)) for _ in range(size)]
+
+        start = time.perf_counter()
+        compiled = CompiledBlocklist(terms)
+        compile_seconds = time.perf_counter() - start
+
+        # Built a second time under tracing, so tracing does not skew the timing
+        tracemalloc.start()
+        CompiledBlocklist(terms)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results.append({
+            "name": f"blocklist_compile/{size}",
+            "params": {"terms": size},
+            "iterations": 1,
+            "opsPerSecond": 1 / compile_seconds,
+            "p50Ms": compile_seconds * 1e3,
+            "p99Ms": compile_seconds * 1e3,
+            "peakMemoryBytes": peak,
+            "bytesPerTerm": compiled.memory_usage()["bytesPerTerm"],
+        })
+
+        for length in PASSWORD_LENGTHS:
+            passwords = [random_word(rng, length) for _ in range(16)]
+            cycle = iter(passwords * (iterations // len(passwords) + 10))
+            results.append(measure(
+                f"blocklist_validator/{size}/{length}",
+                lambda: blocklist_validator(next(cycle), compiled),
+                iterations, terms=size, passwordLength=length
+            ))
+    return results
+
+
+def make_range_response(rng: random.Random, lines: int = 1000) -> bytes:
+    suffixes = sorted(random_word(rng, 35).upper() for _ in range(lines))
+    # Roughly a fifth of a padded response is padding with a count of 0
+    return "\r\n".join(
+        f"{suffix}:{0 if rng.random() < 0.2 else rng.randint(1, 5000)}" for suffix in suffixes
+    ).encode("ascii")
+
+
+def bench_hibp_parse(rng: random.Random, iterations: int) -> list[dict]:
+    body = make_range_response(rng)
+    absent = "F" * 35
+    return [measure("hibp_parse/absent", lambda: suffix_in_range(body, absent), iterations)]
+
+
+def bench_hibp_end_to_end(rng: random.Random, iterations: int) -> list[dict]:
+    password = "correct horse battery staple"
+    sha1 = generate_sha1(password)
+    # Every request gets the same range, which lists the password's suffix
+    payload = make_range_response(rng) + f"\r\n{sha1[5:]}:42".encode("ascii")
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, as against the real API
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    try:
+        with HIBPClient(api_url=f"http://127.0.0.1:{server.server_port}/range/") as client:
+            return [measure("hibp_end_to_end/stub", lambda: client.check(password), iterations)]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def compare(results: list[dict], baseline: dict, threshold: float) -> bool:
+    """Prints the p50 ratio of every case against the baseline; returns False on a regression."""
+    previous = {case["name"]: case for case in baseline["results"]}
+    passed = True
+    print(f"\n{'case':<36}{'baseline p50':>14}{'p50':>12}{'ratio':>9}")
+    for case in results:
+        old = previous.get(case["name"])
+        if old is None:
+            continue
+        ratio = case["p50Ms"] / old["p50Ms"] if old["p50Ms"] else float("inf")
+        regressed = ratio > threshold
+        passed = passed and not regressed
+        print(f"{case['name']:<36}{old['p50Ms']:>12.3f}ms{case['p50Ms']:>10.3f}ms{ratio:>8.2f}x"
+              f"{'  REGRESSION' if regressed else ''}")
+    return passed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,100000",
+                        help="Comma-separated blocklist sizes, e.g. 1000,100000,1000000")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed calls per case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Largest allowed p50 ratio against the baseline")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    # Each group gets its own generator, so its inputs do not depend on the other groups
+    results = []
+    results += bench_levenshtein(random.Random(args.seed), args.iterations * 10)
+    results += bench_blocklist(random.Random(args.seed), sizes, args.iterations)
+    results += bench_hibp_parse(random.Random(args.seed), args.iterations * 10)
+    results += bench_hibp_end_to_end(random.Random(args.seed), args.iterations)
+
+    print(f"{'case':<36}{'ops/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'peak KiB':>11}")
+    for case in results:
+        print(f"{case['name']:<36}{case['opsPerSecond']:>12.1f}{case['p50Ms']:>10.3f}"
+              f"{case['p99Ms']:>10.3f}{case['peakMemoryBytes'] / 1024:>11.1f}")
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            if not compare(results, json.load(file), args.threshold):
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
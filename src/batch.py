@@ -0,0 +1,84 @@
+# src\batch.py
+import os
+from collections import deque
+from itertools import islice
+from typing import Iterable, Iterator
+
+from config import ValidationOptions, ValidationResult
+from validator import validate_password
+
+# Options installed in each worker process by `_init_worker`
+_worker_options: ValidationOptions | None = None
+
+
+def _init_worker(options: ValidationOptions) -> None:
+    global _worker_options
+    _worker_options = options
+
+
+def _validate_chunk(passwords: list[str]) -> list[ValidationResult]:
+    return [validate_password(password, _worker_options) for password in passwords]
+
+
+def _chunks(passwords: Iterable[str], chunk_size: int) -> Iterator[list[str]]:
+    iterator = iter(passwords)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def validate_many(
+    passwords: Iterable[str],
+    options: ValidationOptions,
+    workers: int | None = None,
+    chunk_size: int = 1000
+) -> Iterator[ValidationResult]:
+    """
+    Validates many passwords, spreading the work over a process pool.
+
+    The blocklist is compiled once and shipped to every worker when it
+    starts. Passwords are consumed lazily in chunks and only a few chunks per
+    worker are in flight at a time, so memory stays bounded for inputs of
+    any size.
+
+    Args:
+        passwords (Iterable[str]): The passwords to validate, consumed lazily.
+        options (ValidationOptions): The validation options. Everything in them, `hibpClient`
+            included, must be picklable.
+        workers (int | None): Number of worker processes. Defaults to os.cpu_count(); 1 validates in-process.
+        chunk_size (int): Number of passwords sent to a worker at a time. Default is 1000.
+
+    Yields:
+        ValidationResult: One result per password, in input order.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    options = options.compile()
+
+    if workers <= 1:
+        for password in passwords:
+            yield validate_password(password, options)
+        return
+
+    # Imported here, as multiprocessing is slow to import and only needed with workers
+    import pickle
+    from concurrent.futures import ProcessPoolExecutor
+
+    if options.hibpClient is not None:
+        # Workers get the options pickled; a client they cannot receive must not be swapped silently
+        try:
+            pickle.dumps(options.hibpClient)
+        except Exception as error:
+            raise TypeError(f"hibpClient must be picklable to validate with workers: {error}") from error
+
+    max_in_flight = workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(options,)) as executor:
+        pending = deque()
+        for chunk in _chunks(passwords, chunk_size):
+            pending.append(executor.submit(_validate_chunk, chunk))
+            if len(pending) >= max_in_flight:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,176 @@
+# src\cli.py
+"""
+Bulk password screening from the command line.
+
+Reads one password per line from a file (plain or gzip) or stdin, validates
+every line and writes one JSON object per line:
+
+    {"line": 1, "isValid": false, "errors": ["..."]}
+
+Results are written as they are produced, in input order, so memory stays
+flat for inputs of any size. A throughput summary goes to stderr at the end.
+
+    python src/cli.py passwords.txt --blocklist rockyou.txt.gz --min-length 8 -o results.jsonl
+    cat passwords.txt | python src/cli.py --hibp offline --hibp-offline-path pwned.bin
+"""
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from typing import Iterator, TextIO
+
+from batch import validate_many
+from compiled_blocklist import ARTIFACT_MAGIC, ENGINES, CompiledBlocklist
+from config import ValidationOptions
+from utils.term_store import read_lines
+
+HIBP_MODES = ('off', 'online', 'offline')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Validate passwords in bulk and write the results as JSON lines."
+    )
+    parser.add_argument('input', nargs='?', default='-',
+                        help="File with one password per line, plain or gzip. Default: stdin")
+    parser.add_argument('-o', '--output', default='-', help="Where to write the JSONL results. Default: stdout")
+    parser.add_argument('--encoding', default='utf-8', help="Encoding of the input and blocklist files")
+
+    policy = parser.add_argument_group('policy')
+    policy.add_argument('--min-length', type=int)
+    policy.add_argument('--max-length', type=int)
+    policy.add_argument('--blocklist', help="File with one blocked term per line, plain or gzip, "
+                                            "or an artifact written by CompiledBlocklist.save")
+    policy.add_argument('--matching-sensitivity', type=float, default=0.25)
+    policy.add_argument('--max-edit-distance', type=int, default=5)
+    policy.add_argument('--engine', choices=ENGINES, default='levenshtein')
+    policy.add_argument('--error-limit', type=int)
+    policy.add_argument('--fail-fast', action='store_true', help="Stop at the first failing check")
+    policy.add_argument('--hibp', choices=HIBP_MODES, default='off', help="Breach check mode. Default: off")
+    policy.add_argument('--hibp-offline-path', help="Binary store built by hibp_offline.build_offline_store")
+
+    run = parser.add_argument_group('execution')
+    run.add_argument('--workers', type=int, default=1, help="Worker processes. Default: 1 (in-process)")
+    run.add_argument('--batch-size', type=int, default=1000, help="Passwords sent to a worker at a time")
+    run.add_argument('--echo-password', action='store_true',
+                     help="Include the password itself in every result")
+    return parser
+
+
+def options_from_args(args: argparse.Namespace) -> ValidationOptions:
+    """Builds the validation options, loading the blocklist file once."""
+    if args.hibp == 'offline' and not args.hibp_offline_path:
+        raise ValueError("--hibp offline requires --hibp-offline-path.")
+
+    blocklist = None
+    if args.blocklist:
+        with open(args.blocklist, 'rb') as file:
+            prebuilt = file.read(len(ARTIFACT_MAGIC)) == ARTIFACT_MAGIC
+        if prebuilt:
+            # Prebuilt artifacts carry their own matching settings
+            blocklist = CompiledBlocklist.load(args.blocklist)
+        else:
+            blocklist = CompiledBlocklist.from_file(args.blocklist, {
+                'matchingSensitivity': args.matching_sensitivity,
+                'maxEditDistance': args.max_edit_distance,
+                'engine': args.engine,
+            }, encoding=args.encoding)
+
+    return ValidationOptions(
+        minLength=args.min_length,
+        maxLength=args.max_length,
+        blocklist=blocklist,
+        matchingSensitivity=args.matching_sensitivity,
+        maxEditDistance=args.max_edit_distance,
+        hibpCheck=args.hibp != 'off',
+        errorLimit=args.error_limit,
+        hibpOfflinePath=args.hibp_offline_path if args.hibp == 'offline' else None,
+        failFast=args.fail_fast,
+    )
+
+
+def read_passwords(path: str, encoding: str, stdin: TextIO) -> Iterator[str]:
+    if path == '-':
+        for line in stdin:
+            yield line.rstrip('\r\n')
+    else:
+        yield from read_lines(path, encoding)
+
+
+def main(argv: list[str] | None = None, stdin: TextIO = None, stdout: TextIO = None, stderr: TextIO = None) -> int:
+    """
+    Runs the CLI.
+
+    Args:
+        argv (list[str] | None): Command-line arguments. Defaults to sys.argv[1:].
+        stdin, stdout, stderr (TextIO): Streams to use instead of the sys ones.
+
+    Returns:
+        int: The exit status: 0 when every password is valid, 1 when some are
+        not, 2 on a usage, setup or I/O error, 3 when a check failed to run
+        (e.g. the HIBP API was unreachable). On status 3 the summary covers
+        the passwords validated before the failure.
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        options = options_from_args(args).compile()
+        output = stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    except (OSError, ValueError) as error:
+        print(f"error: {error}", file=stderr)
+        return 2
+    loaded = time.perf_counter()
+
+    total = invalid = 0
+    failed = False
+    try:
+        passwords = read_passwords(args.input, args.encoding, stdin)
+        if args.echo_password:
+            # Keep the passwords of the chunks in flight, to pair them with their results
+            echoed = deque()
+            passwords = (echoed.append(password) or password for password in passwords)
+
+        results = validate_many(passwords, options, workers=args.workers, chunk_size=args.batch_size)
+        for line_number, result in enumerate(results, start=1):
+            record = {"line": line_number, "isValid": result.isValid, "errors": result.errors}
+            if args.echo_password:
+                record["password"] = echoed.popleft()
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+            total += 1
+            invalid += not result.isValid
+            if total % args.batch_size == 0:
+                output.flush()
+    except (OSError, ValueError) as error:
+        print(f"error: {error}", file=stderr)
+        return 2
+    except RuntimeError as error:
+        # A check could not run; the results written so far stay valid
+        print(f"error: {error}", file=stderr)
+        failed = True
+    finally:
+        if output is not stdout:
+            output.close()
+        else:
+            output.flush()
+
+    elapsed = time.perf_counter() - loaded
+    print(
+        f"validated {total} passwords ({invalid} invalid) in {elapsed:.2f}s, "
+        f"{total / elapsed if elapsed else 0:.0f} passwords/s; setup took {loaded - start:.2f}s",
+        file=stderr
+    )
+    if failed:
+        return 3
+    return 1 if invalid else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
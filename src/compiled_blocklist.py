@@ -0,0 +1,568 @@
+# src\compiled_blocklist.py
+import heapq
+import itertools
+import pickle
+import sys
+import threading
+from bisect import bisect_left
+from typing import Iterable, NamedTuple
+
+from metrics import get_metrics_hook
+from utils.aho_corasick import AhoCorasick
+from utils.levenshtein_distance import levenshtein_within
+from utils.myers import approximate_substring_within, pattern_bitmasks
+from utils.numpy_levenshtein import blocked_term_rows, encode, encode_terms, numpy_available
+from utils.qgram_index import QGramIndex, qgram_lower_bound
+from utils.term_store import TermStore, read_lines
+
+ENGINES = ('levenshtein', 'myers', 'numpy')
+
+# Leads every file written by CompiledBlocklist.save; bump the version when the layout changes
+ARTIFACT_MAGIC = b"NISTBLK\x03"
+
+
+class LengthBucket(NamedTuple):
+    """A run of same-length terms, stored contiguously in `CompiledBlocklist.terms`."""
+    length: int
+    start: int
+    stop: int
+    tolerance: int | None  # None when a custom distance calculator is used
+
+
+class OverlayRun(NamedTuple):
+    """Terms added and removed by one or more consecutive updates; never modified once published."""
+    added: "CompiledBlocklist | None"  # Index of the added terms, None when there are none
+    removed: frozenset[str]  # Tombstones hiding terms of older runs and of the base
+
+    def size(self) -> int:
+        return (len(self.added.terms) if self.added is not None else 0) + len(self.removed)
+
+
+class Overlay(NamedTuple):
+    """Updates since a `CompiledBlocklist` was built; replaced whole on every update."""
+    runs: tuple[OverlayRun, ...]  # Oldest first; a newer run takes precedence over older ones
+    size: int  # Number of blocked terms, updates included
+    version: int
+
+
+class CompiledBlocklist:
+    """
+    A blocklist that is normalized once and reused for many password checks.
+
+    Building an instance strips, lowercases and deduplicates the terms,
+    packs them into a compact `TermStore` grouped into length buckets with a
+    precomputed fuzzy tolerance, and builds two indexes: an Aho-Corasick
+    automaton that finds verbatim occurrences of terms, and a q-gram inverted
+    index that rules out terms sharing too few q-grams with the password to
+    be within their tolerance. The indexes are never modified after
+    construction, so one instance can be shared across requests and threads;
+    `add` and `remove` publish the changes as a separate overlay snapshot.
+
+    Args:
+        blocklist (Iterable[str] | None): The blocked terms.
+        options (dict, optional): Compile-time settings. Defaults to None.
+            matchingSensitivity (float): Controls matching strictness based on term length. Default is 0.25 (25%).
+            maxEditDistance (int): Maximum character differences allowed for fuzzy matches. Default is 5.
+            customDistanceCalculator (callable): Custom function to calculate edit distance.
+            trimWhitespace (bool): Whether to trim leading/trailing whitespace from blocklist terms. Default is True.
+            engine (str): Matching engine. Default is 'levenshtein'.
+                'levenshtein' compares the term against every password window of the same length.
+                'myers' scans the password once per term with a bit-parallel search and also
+                matches substrings of other lengths, so it can block more than 'levenshtein'.
+                'numpy' gives the same results as 'levenshtein' but scores all remaining terms of a
+                length bucket against all password windows at once. Without NumPy installed, or
+                with a custom distance calculator, it runs the 'levenshtein' engine instead.
+            qgramSize (int): Length of the q-grams used to prune candidate terms. Default is 2.
+    """
+
+    def __init__(self, blocklist: Iterable[str] | None = None, options: dict = None):
+        if options is None:
+            options = {}
+
+        self.matching_sensitivity = options.get('matchingSensitivity', 0.25)
+        self.max_edit_distance = options.get('maxEditDistance', 5)
+        self.custom_distance_calculator = options.get('customDistanceCalculator')
+        self.trim_whitespace = options.get('trimWhitespace', True)
+        self.engine = options.get('engine', 'levenshtein')
+
+        if self.engine not in ENGINES:
+            raise ValueError(f"Unknown blocklist engine: {self.engine!r}. Expected one of {ENGINES}.")
+        if self.engine == 'numpy' and (not numpy_available() or self.custom_distance_calculator):
+            self.engine = 'levenshtein'
+
+        self.qgram_size = options.get('qgramSize', 2)
+
+        # The store dedupes the streamed terms and lays every length bucket out
+        # contiguously; terms of equal length keep their original order
+        self.terms = TermStore.from_terms(
+            term for term in map(self.normalize, blocklist or ()) if term is not None
+        )
+
+        # Tolerances only depend on the term length unless a custom calculator is used
+        self.buckets = tuple(
+            LengthBucket(
+                length, start, stop,
+                None if self.custom_distance_calculator else self.length_tolerance(length)
+            )
+            for length, start, stop in self.terms.runs()
+        )
+
+        self.exact_matcher = AhoCorasick(self.terms)
+        self.qgram_index = QGramIndex(self.terms, self.qgram_size)
+
+        if self.engine == 'myers':
+            self.bitmasks = tuple(pattern_bitmasks(term) for term in self.terms)
+        else:
+            self.bitmasks = None
+
+        if self.engine == 'numpy':
+            # One code-point matrix per bucket; rows follow the bucket's term order
+            self.code_points = tuple(
+                encode_terms(self.terms[bucket.start:bucket.stop], bucket.length)
+                for bucket in self.buckets
+            )
+        else:
+            self.code_points = None
+
+        self._overlay = Overlay((), len(self.terms), 0)
+        self._write_lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state['_write_lock']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._write_lock = threading.Lock()
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        options: dict = None,
+        encoding: str = 'utf-8',
+        errors: str = 'strict'
+    ) -> "CompiledBlocklist":
+        """
+        Builds a compiled blocklist from a text file with one term per line.
+
+        The file, plain or gzip-compressed, is streamed one line at a time,
+        so huge wordlists are never held in memory as a list of strings.
+
+        Args:
+            path (str): Path to the blocklist file.
+            options (dict, optional): Compile-time settings, see the class docstring.
+            encoding (str): File encoding. Default is 'utf-8'.
+            errors (str): How to handle undecodable bytes, as in `open`. Default is 'strict'.
+
+        Returns:
+            CompiledBlocklist: The compiled blocklist.
+        """
+        return cls(read_lines(path, encoding, errors), options)
+
+    def save(self, path: str) -> None:
+        """
+        Writes the compiled blocklist to `path`, so that `load` can restore it
+        without normalizing and indexing the terms again.
+
+        The terms and both indexes are flat arrays, so the file is mostly raw
+        buffers and loads in milliseconds. A custom distance calculator is
+        saved by reference and must be importable when loading.
+
+        Args:
+            path (str): Where to write the artifact.
+        """
+        with open(path, 'wb') as file:
+            file.write(ARTIFACT_MAGIC)
+            pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledBlocklist":
+        """
+        Reads a compiled blocklist written by `save`.
+
+        The artifact is a pickle: only load files you built yourself.
+
+        Args:
+            path (str): Path to the artifact.
+
+        Returns:
+            CompiledBlocklist: The compiled blocklist.
+        """
+        with open(path, 'rb') as file:
+            if file.read(len(ARTIFACT_MAGIC)) != ARTIFACT_MAGIC:
+                raise ValueError(f"{path} is not a compiled blocklist artifact.")
+            blocklist = pickle.load(file)
+        if not isinstance(blocklist, cls):
+            raise ValueError(f"{path} is not a compiled blocklist artifact.")
+        return blocklist
+
+    def __len__(self) -> int:
+        return self._overlay.size
+
+    def __contains__(self, term: str) -> bool:
+        term = self.normalize(term)
+        return term is not None and self._blocked(term, self._overlay.runs)
+
+    def _blocked(self, term: str, runs: tuple[OverlayRun, ...]) -> bool:
+        """Checks whether a normalized term is blocked once `runs` are applied."""
+        for run in reversed(runs):
+            if term in run.removed:
+                return False
+            if run.added is not None and run.added._indexed(term):
+                return True
+        return self._indexed(term)
+
+    def _indexed(self, term: str) -> bool:
+        """Checks whether a normalized term is in the indexes this instance was built with."""
+        # Of the terms occurring in `term`, only `term` itself has its length
+        return any(len(self.terms[index]) == len(term) for index in self.exact_matcher.find_all(term))
+
+    @property
+    def version(self) -> int:
+        """Number of updates applied with `add` and `remove`; changes whenever the blocked terms do."""
+        return self._overlay.version
+
+    def normalize(self, term: str) -> str | None:
+        """Normalizes a term the way the blocklist stores it; None for a blank term."""
+        if not term.strip():
+            return None
+        return term.strip().lower() if self.trim_whitespace else term.lower()
+
+    def options(self) -> dict:
+        """Returns the compile-time settings, as accepted by the constructor."""
+        options = {
+            'matchingSensitivity': self.matching_sensitivity,
+            'maxEditDistance': self.max_edit_distance,
+            'trimWhitespace': self.trim_whitespace,
+            'engine': self.engine,
+            'qgramSize': self.qgram_size,
+        }
+        if self.custom_distance_calculator:
+            options['customDistanceCalculator'] = self.custom_distance_calculator
+        return options
+
+    def add(self, terms: Iterable[str]) -> int:
+        """
+        Blocks more terms without rebuilding the blocklist.
+
+        Each update is indexed as a small overlay run of its own. Runs are
+        merged with their older neighbour once it is no more than twice their
+        size, so there are at most about log2(n) of them and an update costs
+        amortized O(k log n) for k changed terms, however large the
+        blocklist or the overlay. Checks running concurrently keep using the
+        previous snapshot until the new one is published; they never wait for
+        an update. `compact` folds the runs into a fresh build.
+
+        Args:
+            terms (Iterable[str]): The terms to block.
+
+        Returns:
+            int: Number of terms that were not blocked before.
+        """
+        with self._write_lock:
+            runs = self._overlay.runs
+            added = {}
+            for term in map(self.normalize, terms):
+                if term is not None and term not in added and not self._blocked(term, runs):
+                    added[term] = None
+            if added:
+                self._publish(OverlayRun(CompiledBlocklist(added, self.options()), frozenset()), len(added))
+            return len(added)
+
+    def remove(self, terms: Iterable[str]) -> int:
+        """
+        Unblocks terms without rebuilding the blocklist.
+
+        The terms are recorded as tombstones in a new overlay run, which
+        hides them in the base and in older runs; like `add`, this publishes
+        a new snapshot without blocking concurrent checks.
+
+        Args:
+            terms (Iterable[str]): The terms to unblock.
+
+        Returns:
+            int: Number of terms that were blocked before.
+        """
+        with self._write_lock:
+            runs = self._overlay.runs
+            removed = set()
+            for term in map(self.normalize, terms):
+                if term is not None and term not in removed and self._blocked(term, runs):
+                    removed.add(term)
+            if removed:
+                self._publish(OverlayRun(None, frozenset(removed)), -len(removed))
+            return len(removed)
+
+    def _publish(self, run: OverlayRun, size_change: int) -> None:
+        overlay = self._overlay
+        runs = list(overlay.runs)
+        runs.append(run)
+        # Merging by size class keeps run sizes at least doubling towards the oldest
+        while len(runs) > 1 and runs[-2].size() <= 2 * runs[-1].size():
+            newer = runs.pop()
+            runs[-1] = self._merge_runs(runs[-1], newer)
+        # A single attribute store, so readers see the whole update or none of it
+        self._overlay = Overlay(
+            tuple(run for run in runs if run.size()),
+            overlay.size + size_change,
+            overlay.version + 1
+        )
+
+    def _merge_runs(self, older: OverlayRun, newer: OverlayRun) -> OverlayRun:
+        older_added = tuple(older.added.terms) if older.added is not None else ()
+        newer_added = tuple(newer.added.terms) if newer.added is not None else ()
+        # A run only adds terms that were not blocked below it and only removes
+        # terms that were, so a term added by one and removed by the other is
+        # back to its state below both and drops out of the merged run
+        added = [term for term in older_added if term not in newer.removed]
+        added += [term for term in newer_added if term not in older.removed]
+        removed = older.removed.difference(newer_added).union(newer.removed.difference(older_added))
+        return OverlayRun(CompiledBlocklist(added, self.options()) if added else None, removed)
+
+    def compact(self) -> "CompiledBlocklist":
+        """
+        Returns a new compiled blocklist with the added and removed terms folded into its indexes.
+
+        This costs a full build, so run it off the request path and swap the
+        result in, e.g. with `ValidationOptions.replace(blocklist=...)`.
+        """
+        runs = self._overlay.runs
+        # Term -> position of the newest run that removed it
+        removed_by = {term: position for position, run in enumerate(runs) for term in run.removed}
+
+        def visible(terms: Iterable[str], position: int) -> Iterable[str]:
+            return (term for term in terms if removed_by.get(term, -1) <= position)
+
+        layers = [visible(self.terms, -1)]
+        layers += [visible(run.added.terms, position) for position, run in enumerate(runs) if run.added is not None]
+        return CompiledBlocklist(itertools.chain.from_iterable(layers), self.options())
+
+    def memory_usage(self) -> dict:
+        """
+        Reports the memory held by the compiled blocklist.
+
+        Every structure kept for matching is counted: the packed terms, the
+        Aho-Corasick automaton, the q-gram postings, the engine's
+        precomputed Myers bitmasks or NumPy code points, and the overlay of
+        added and removed terms.
+
+        Returns:
+            dict: Number of terms, bytes of each structure, their total and
+            total bytes per term.
+        """
+        usage = {
+            "terms": len(self),
+            "termBytes": self.terms.nbytes(),
+            "exactMatcherBytes": self.exact_matcher.nbytes(),
+            "qgramIndexBytes": self.qgram_index.nbytes(),
+            "bitmaskBytes": 0,
+            "codePointBytes": 0,
+            "overlayBytes": 0,
+        }
+        if self.bitmasks is not None:
+            # Masks up to 256 are cached int objects, shared by every dict
+            usage["bitmaskBytes"] = sys.getsizeof(self.bitmasks) + sum(
+                sys.getsizeof(bitmasks) + sum(sys.getsizeof(mask) for mask in bitmasks.values() if mask > 256)
+                for bitmasks in self.bitmasks
+            )
+        if self.code_points is not None:
+            usage["codePointBytes"] = sum(codes.nbytes for codes in self.code_points)
+        for run in self._overlay.runs:
+            usage["overlayBytes"] += sys.getsizeof(run.removed) + sum(map(sys.getsizeof, run.removed))
+            if run.added is not None:
+                usage["overlayBytes"] += run.added.memory_usage()["totalBytes"]
+
+        usage["totalBytes"] = sum(value for name, value in usage.items() if name.endswith("Bytes"))
+        usage["bytesPerTerm"] = usage["totalBytes"] / usage["terms"] if usage["terms"] else 0.0
+        return usage
+
+    def length_tolerance(self, length: int) -> int:
+        """Returns the number of edits allowed for a term of `length` characters."""
+        return max(
+            min(
+                int(length * self.matching_sensitivity),
+                self.max_edit_distance
+            ),
+            0
+        )
+
+    def fuzzy_tolerance(self, term: str, password: str = '') -> int:
+        """Returns the number of edits allowed when matching `term`."""
+        if self.custom_distance_calculator:
+            return self.custom_distance_calculator(term, password)
+        return self.length_tolerance(len(term))
+
+    def bucket_can_match(self, bucket: LengthBucket, password_length: int) -> bool:
+        """Checks whether any term of `bucket` can match a password of the given length."""
+        if bucket.tolerance is None or bucket.length <= bucket.tolerance:
+            return True
+        if self.engine == 'myers':
+            # Every substring is at least len(term) - tolerance characters long
+            return bucket.length <= password_length + bucket.tolerance
+        # The sliding window only compares windows as long as the term
+        return bucket.length <= password_length
+
+    def is_term_blocked(self, lowered_password: str, term: str, fuzzy_tolerance: int, index: int = None) -> bool:
+        """Checks whether a substring of `lowered_password` is within `fuzzy_tolerance` edits of `term`."""
+        # A term no longer than its tolerance is within reach of any password
+        if len(term) <= fuzzy_tolerance:
+            return True
+
+        if self.engine == 'myers':
+            bitmasks = self.bitmasks[index] if index is not None else None
+            return approximate_substring_within(lowered_password, term, fuzzy_tolerance, bitmasks)
+
+        term_length = len(term)
+        for i in range(len(lowered_password) - term_length + 1):
+            if levenshtein_within(lowered_password[i:i + term_length], term, fuzzy_tolerance):
+                return True
+        return False
+
+    def check(self, password: str, error_limit: float = float('inf')) -> dict:
+        """
+        Validates a password against the compiled blocklist.
+
+        Terms are checked bucket by bucket, shortest first, so errors are
+        reported in that order.
+
+        Args:
+            password (str): The password to validate.
+            error_limit (float): Maximum number of errors to report. Default is float('inf').
+
+        Returns:
+            dict: Contains a boolean indicating validity and a list of error messages.
+        """
+        # Read once, so an update published meanwhile is seen entirely or not at all
+        runs = self._overlay.runs
+
+        if not runs:
+            blocked = self.blocked_terms(password, error_limit)
+        else:
+            # The base and every run with added terms report their own matches, minus
+            # those hidden by the tombstones of newer runs
+            layers = []
+            for position in range(-1, len(runs)):
+                index = self if position < 0 else runs[position].added
+                if index is None:
+                    continue
+                newer = runs[position + 1:]
+                # Removed terms may take up some of the limit before they are dropped
+                hidden = sum(len(run.removed) for run in newer)
+                found = index.blocked_terms(password, error_limit + hidden)
+                if hidden:
+                    found = [term for term in found if not any(term in run.removed for run in newer)]
+                layers.append(found)
+            blocked = list(heapq.merge(*layers, key=len))
+            if len(blocked) > error_limit:
+                del blocked[int(error_limit):]
+
+        errors = [f'Password contains a substring too similar to: "{term}".' for term in blocked]
+        return {"isValid": len(errors) == 0, "errors": errors}
+
+    def blocked_terms(self, password: str, limit: float = float('inf')) -> list[str]:
+        """
+        Returns the indexed terms `password` is too similar to, shortest first.
+
+        Terms added or removed since construction are not taken into account;
+        `check` applies them.
+
+        Args:
+            password (str): The password to validate.
+            limit (float): Stop once this many terms are found. Default is float('inf').
+
+        Returns:
+            list[str]: The blocked terms.
+        """
+        found = []
+        lowered_password = password.lower()
+        password_length = len(lowered_password)
+        encoded_password = encode(lowered_password) if self.engine == 'numpy' else None
+
+        # One pass over the password finds every verbatim occurrence of a term
+        exact_hits = self.exact_matcher.find_all(lowered_password)
+        lowered_password_chars = set(lowered_password)
+        shared_qgrams = self.qgram_index.shared_counts(lowered_password)
+        q = self.qgram_index.q
+
+        # Ids of the terms the indexes know something about, in term order
+        indexed = sorted(exact_hits.union(shared_qgrams))
+
+        def prefilter(index: int, length: int, fuzzy_tolerance: int) -> bool | None:
+            """Returns the verdict when the indexes decide it, None when the term must be looked at."""
+            if index in exact_hits:
+                return fuzzy_tolerance >= 0
+            if qgram_lower_bound(length, fuzzy_tolerance, q) > shared_qgrams.get(index, 0):
+                # Too few shared q-grams for any substring to be within tolerance
+                return False
+            return None
+
+        def scan(index: int, term: str, fuzzy_tolerance: int) -> bool:
+            nonlocal distance_calls
+            if len(term) > fuzzy_tolerance and lowered_password_chars.isdisjoint(term):
+                # Every window of the password would need all len(term) edits
+                return False
+            distance_calls += 1
+            return self.is_term_blocked(lowered_password, term, fuzzy_tolerance, index)
+
+        hook = get_metrics_hook()
+        visited = distance_calls = 0
+        try:
+            for bucket_number, bucket in enumerate(self.buckets):
+                # Whole buckets that cannot reach the password are skipped without per-term work
+                if not self.bucket_can_match(bucket, password_length):
+                    continue
+
+                if bucket.tolerance is not None and qgram_lower_bound(bucket.length, bucket.tolerance, q) > 0:
+                    # Terms sharing no q-gram with the password are pruned, so only
+                    # the indexed ones are visited
+                    candidates = indexed[bisect_left(indexed, bucket.start):bisect_left(indexed, bucket.stop)]
+                else:
+                    candidates = range(bucket.start, bucket.stop)
+                visited += len(candidates)
+
+                if encoded_password is not None:
+                    # Score every term left after prefiltering in a single vectorized pass
+                    verdicts = {index: prefilter(index, bucket.length, bucket.tolerance) for index in candidates}
+                    pending = [
+                        index for index, verdict in verdicts.items()
+                        if verdict is None and not lowered_password_chars.isdisjoint(self.terms[index])
+                    ]
+                    for index, verdict in verdicts.items():
+                        if verdict is None:
+                            verdicts[index] = bucket.length <= bucket.tolerance
+                    if pending and bucket.length > bucket.tolerance:
+                        distance_calls += len(pending)
+                        codes = self.code_points[bucket_number][[index - bucket.start for index in pending]]
+                        blocked_rows = set(blocked_term_rows(codes, encoded_password, bucket.tolerance).tolist())
+                        for row, index in enumerate(pending):
+                            verdicts[index] = row in blocked_rows
+
+                for index in candidates:
+                    if encoded_password is not None:
+                        blocked = verdicts[index]
+                    elif bucket.tolerance is None:
+                        term = self.terms[index]
+                        fuzzy_tolerance = self.fuzzy_tolerance(term, password)
+                        blocked = prefilter(index, bucket.length, fuzzy_tolerance)
+                        if blocked is None:
+                            blocked = scan(index, term, fuzzy_tolerance)
+                    else:
+                        # Terms are only decoded from the store once the indexes leave them undecided
+                        blocked = prefilter(index, bucket.length, bucket.tolerance)
+                        if blocked is None:
+                            blocked = scan(index, self.terms[index], bucket.tolerance)
+
+                    if blocked:
+                        found.append(self.terms[index])
+                        if len(found) >= limit:
+                            # Stop further checks when the limit is reached
+                            return found
+
+            return found
+        finally:
+            if hook is not None:
+                hook.count('blocklist.termsScanned', visited)
+                hook.count('blocklist.termsPruned', len(self.terms) - visited)
+                hook.count('blocklist.levenshteinCalls', distance_calls)
@@ -1,25 +1,258 @@
 # nist_password_validator/config.py
 
+import threading
+from collections import OrderedDict
 from typing import List, Optional
 
+from compiled_blocklist import CompiledBlocklist
+
+_FIELDS = ('minLength', 'maxLength', 'blocklist', 'matchingSensitivity', 'maxEditDistance',
+           'hibpCheck', 'errorLimit', 'hibpOfflinePath', 'failFast', 'hibpClient')
+
 class ValidationOptions:
+    """
+    Immutable, hashable validation settings.
+
+    `compile()` validates the settings and returns the equivalent options with
+    the blocklist compiled and the offline HIBP store opened. The result is
+    kept on the options, so options that are held on to are compiled once.
+    Equal options share one compiled instance through a registry (of the most
+    recently used MAX_COMPILED_OPTIONS policies), and policies that only differ
+    outside the blocklist settings share one CompiledBlocklist.
+    """
+
+    __slots__ = _FIELDS + ('_key', '_hash', '_compiled', '_resolvedClient', '_compiledOptions')
+
     def __init__(self, minLength: Optional[int] = None,
                  maxLength: Optional[int] = None,
                  blocklist: Optional[List[str]] = None,
-                 matchingSensitivity: Optional[float] = 0.25,
-                 maxEditDistance: Optional[int] = 5,
-                 hibpCheck: Optional[bool] = False
-                  errorLimit:Optional[int] ):
-        self.minLength = minLength
-        self.maxLength = maxLength
-        self.blocklist = blocklist or []
-        self.matchingSensitivity = matchingSensitivity
-        self.maxEditDistance = maxEditDistance
-        self.hibpCheck = hibpCheck
-
-        
+                 matchingSensitivity: float = 0.25,
+                 maxEditDistance: int = 5,
+                 hibpCheck: Optional[bool] = False,
+                 errorLimit: Optional[int] = None,
+                 hibpOfflinePath: Optional[str] = None,
+                 failFast: Optional[bool] = False,
+                 hibpClient: Optional[object] = None):
+        if blocklist is None:
+            blocklist = ()
+        elif not isinstance(blocklist, CompiledBlocklist):
+            blocklist = tuple(blocklist)
+
+        values = {
+            'minLength': minLength,
+            'maxLength': maxLength,
+            'blocklist': blocklist,
+            'matchingSensitivity': matchingSensitivity,
+            'maxEditDistance': maxEditDistance,
+            'hibpCheck': hibpCheck,
+            'errorLimit': errorLimit,
+            # Binary store built by hibp_offline.build_offline_store; checks HIBP offline when set
+            'hibpOfflinePath': hibpOfflinePath,
+            # Stop at the first failing check (or at errorLimit) instead of reporting every error
+            'failFast': failFast,
+            # HIBPClient or OfflineHIBPStore to check breaches with; must be picklable for validate_many workers
+            'hibpClient': hibpClient,
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+        key = tuple(values.values())
+        object.__setattr__(self, '_key', key)
+        object.__setattr__(self, '_hash', hash(key))
+        object.__setattr__(self, '_compiled', False)
+        # Whether hibpClient was opened by compile() rather than passed by the caller
+        object.__setattr__(self, '_resolvedClient', False)
+        # (registry generation, compiled options) once compile() has been called
+        object.__setattr__(self, '_compiledOptions', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ValidationOptions is immutable; use replace() to derive new options.")
+
+    def __delattr__(self, name):
+        raise AttributeError("ValidationOptions is immutable.")
+
+    def __eq__(self, other):
+        if not isinstance(other, ValidationOptions):
+            return NotImplemented
+        return self is other or (self._hash == other._hash and self._key == other._key)
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        fields = ', '.join(
+            f'{name}=<{len(value)} terms>' if name == 'blocklist' else f'{name}={value!r}'
+            for name, value in zip(_FIELDS, self._key)
+        )
+        return f'ValidationOptions({fields})'
+
+    def __reduce__(self):
+        # A store opened by compile() holds a memory map; it is resolved again after
+        # unpickling. A client passed by the caller is pickled along, as it was chosen
+        # on purpose (e.g. an offline store that must not be swapped for the online API).
+        values = dict(zip(_FIELDS, self._key))
+        if self._resolvedClient:
+            values['hibpClient'] = None
+        return (_restore, (values, self._compiled))
+
+    def replace(self, **changes) -> "ValidationOptions":
+        """Returns new, uncompiled options with some settings changed."""
+        values = dict(zip(_FIELDS, self._key))
+        values.update(changes)
+        return ValidationOptions(**values)
+
+    def compile(self) -> "ValidationOptions":
+        """
+        Validates the settings and returns the compiled equivalent of these options.
+
+        The result has a `CompiledBlocklist` as its blocklist and, when
+        `hibpCheck` and `hibpOfflinePath` are set without a `hibpClient`, the
+        opened offline store as `hibpClient`. The shared online client is only
+        resolved when a check needs it, so async callers never create it.
+        Compiling equal options again returns the same instance.
+
+        The CompiledBlocklist is shared by every policy with the same terms and
+        matching settings, so `add()` and `remove()` on it change all of them;
+        pass a CompiledBlocklist of its own to a policy that is updated alone.
+        """
+        if self._compiled:
+            return self
+        generation = _generation
+        cached = self._compiledOptions
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+
+        compiled = _lookup_compiled(self)
+        if compiled is None:
+            # Builds are serialized so a policy is compiled once; lookups do not wait on them
+            with _build_lock:
+                compiled = _lookup_compiled(self)
+                if compiled is None:
+                    compiled = self._build_compiled()
+                    with _registry_lock:
+                        _registry[self] = compiled
+                        while len(_registry) > MAX_COMPILED_OPTIONS:
+                            _registry.popitem(last=False)
+        object.__setattr__(self, '_compiledOptions', (generation, compiled))
+        return compiled
+
+    def _build_compiled(self) -> "ValidationOptions":
+        if self.minLength is not None and self.minLength < 0:
+            raise ValueError("minLength must not be negative.")
+        if self.maxLength is not None and self.maxLength < (self.minLength or 0):
+            raise ValueError("maxLength must not be smaller than minLength.")
+        if not _is_number(self.matchingSensitivity):
+            raise ValueError("matchingSensitivity must be a number.")
+        if self.matchingSensitivity < 0:
+            raise ValueError("matchingSensitivity must not be negative.")
+        if not _is_number(self.maxEditDistance):
+            raise ValueError("maxEditDistance must be a number.")
+        if self.maxEditDistance < 0:
+            raise ValueError("maxEditDistance must not be negative.")
+        if self.errorLimit is not None:
+            if not isinstance(self.errorLimit, int) or isinstance(self.errorLimit, bool):
+                raise ValueError("errorLimit must be an integer.")
+            if self.errorLimit < 1:
+                raise ValueError("errorLimit must be at least 1.")
+
+        blocklist = self.blocklist
+        if blocklist and not isinstance(blocklist, CompiledBlocklist):
+            blocklist = _compile_blocklist(self)
+
+        hibp_client = self.hibpClient
+        resolved = False
+        if self.hibpCheck and hibp_client is None and self.hibpOfflinePath:
+            from hibp_offline import get_offline_store
+            hibp_client = get_offline_store(self.hibpOfflinePath)
+            resolved = True
+
+        compiled = self.replace(blocklist=blocklist, hibpClient=hibp_client)
+        object.__setattr__(compiled, '_compiled', True)
+        object.__setattr__(compiled, '_resolvedClient', resolved)
+        return compiled
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _restore(values: dict, compiled: bool) -> ValidationOptions:
+    options = ValidationOptions(**values)
+    object.__setattr__(options, '_compiled', compiled)
+    return options
+
+
+# Maximum number of compiled policies kept by the registry, least recently used evicted first
+MAX_COMPILED_OPTIONS = 128
+
+# Maximum number of compiled blocklists kept for sharing between policies
+MAX_COMPILED_BLOCKLISTS = 128
+
+# Source options -> compiled options, shared by every caller in the process
+_registry: OrderedDict = OrderedDict()
+# (terms, matchingSensitivity, maxEditDistance) -> CompiledBlocklist
+_blocklist_registry: OrderedDict = OrderedDict()
+_registry_lock = threading.Lock()
+_build_lock = threading.Lock()
+# Bumped by clear_compiled_options() so options compiled before it compile again
+_generation = 0
+
+
+def _lookup_compiled(options: ValidationOptions) -> ValidationOptions | None:
+    with _registry_lock:
+        compiled = _registry.get(options)
+        if compiled is not None:
+            _registry.move_to_end(options)
+        return compiled
+
+
+def _compile_blocklist(options: ValidationOptions) -> CompiledBlocklist:
+    # Called with _build_lock held; errorLimit only applies when checking, so it is not part of the key
+    key = (options.blocklist, options.matchingSensitivity, options.maxEditDistance)
+    with _registry_lock:
+        blocklist = _blocklist_registry.get(key)
+        if blocklist is not None:
+            _blocklist_registry.move_to_end(key)
+            return blocklist
+    blocklist = CompiledBlocklist(options.blocklist, blocklist_options(options))
+    with _registry_lock:
+        _blocklist_registry[key] = blocklist
+        while len(_blocklist_registry) > MAX_COMPILED_BLOCKLISTS:
+            _blocklist_registry.popitem(last=False)
+    return blocklist
+
+
+def clear_compiled_options() -> None:
+    """Forgets every compiled ValidationOptions, e.g. after blocklist files changed on disk."""
+    global _generation
+    with _registry_lock:
+        _registry.clear()
+        _blocklist_registry.clear()
+        _generation += 1
+
+
+def blocklist_options(options: ValidationOptions) -> dict:
+    """Translates `ValidationOptions` into the options dict of `blocklist_validator`."""
+    return {
+        'matchingSensitivity': options.matchingSensitivity,
+        'maxEditDistance': options.maxEditDistance,
+        'errorLimit': options.errorLimit if options.errorLimit is not None else float('inf'),
+    }
+
+
+def resolve_hibp_client(options: ValidationOptions):
+    """Returns the client HIBP checks should use: `hibpClient`, the offline store or the shared online client."""
+    if options.hibpClient is not None:
+        return options.hibpClient
+    if options.hibpOfflinePath:
+        from hibp_offline import get_offline_store
+        return get_offline_store(options.hibpOfflinePath)
+    from hibp import get_default_client
+    return get_default_client()
+
+
 
 class ValidationResult:
     def __init__(self, isValid: bool, errors: List[str]):
         self.isValid = isValid
-        self.errors = errors
\ No newline at end of file
+        self.errors = errors
@@ -1,6 +1,12 @@
 # src\hibp.py
 import hashlib
-import requests
+import threading
+import time
+from itertools import islice
+from typing import Iterable
+
+from hibp_cache import RangeCache, parse_range
+from metrics import get_metrics_hook
 
 API_URL = "https://api.pwnedpasswords.com/range/"
 
@@ -11,6 +17,31 @@ class ValidationResult:
         self.errors = errors
 
 
+def suffix_in_range(body: bytes, suffix: str) -> bool:
+    """
+    Checks if a range response lists `suffix` with a non-zero count.
+
+    The raw body is searched for the suffix directly, so no line is split,
+    decoded or allocated, padding included; only the count of the matching
+    line is parsed.
+
+    :param body: The raw range response body.
+    :param suffix: The last 35 characters of an uppercase SHA-1 hash.
+    :return: True if the suffix has been seen in a breach.
+    """
+    needle = suffix.encode("ascii")
+    position = body.find(needle)
+    while position != -1:
+        end = position + len(needle)
+        # Only a whole suffix field counts: at the start of a line, followed by ':'
+        at_line_start = position == 0 or body[position - 1] in b"\r\n"
+        if at_line_start and end < len(body) and body[end] == ord(":"):
+            line_end = body.find(b"\n", end)
+            return int(body[end + 1:line_end if line_end != -1 else len(body)]) > 0
+        position = body.find(needle, end)
+    return False
+
+
 def generate_sha1(password: str) -> str:
     """
     Generates a SHA-1 hash for the given password.
@@ -22,24 +53,92 @@ def generate_sha1(password: str) -> str:
     return sha1_hash.upper()
 
 
-def hibp_validator(password: str) -> ValidationResult:
+HEADERS = {
+    "User-Agent": "NIST-password-validator-py",
+    "Add-Padding": "true"
+}
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class HIBPClient:
     """
-    Checks if the given password has been exposed in a data breach.
+    Client for the HaveIBeenPwned range API.
 
-    :param password: The password to check.
-    :return: ValidationResult indicating if the password has been compromised.
+    Owns a pooled `requests.Session`, so connections are kept alive and reused
+    across checks. Requests time out, and 429/5xx responses and connection
+    errors are retried with exponential backoff. A client can be shared
+    between threads.
+
+    :param api_url: Base URL of the range API.
+    :param pool_size: Maximum number of pooled connections.
+    :param connect_timeout: Seconds to wait for a connection.
+    :param read_timeout: Seconds to wait for a response.
+    :param retries: Number of retries on 429/5xx responses and connection errors.
+    :param backoff_factor: Backoff between retries, in seconds, doubled after each retry.
+    :param cache: Optional cache of parsed range responses, keyed by prefix.
     """
-    try:
-        sha1 = generate_sha1(password)
-        prefix = sha1[:5]
-        suffix = sha1[5:]
 
-        headers = {
-            "User-Agent": "NIST-password-validator-py",
-            "Add-Padding": "true"
-        }
+    def __init__(
+        self,
+        api_url: str = API_URL,
+        pool_size: int = 10,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10.0,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        cache: RangeCache | None = None
+    ):
+        self.api_url = api_url
+        self.cache = cache
+        self.timeout = (connect_timeout, read_timeout)
 
-        response = requests.get(f"{API_URL}{prefix}", headers=headers)
+        # Imported on first use, so callers that never go online do not pay for requests
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self) -> None:
+        """Closes the pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "HIBPClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def fetch_range(self, prefix: str) -> bytes:
+        """
+        Fetches the range of hash suffixes sharing a 5-character SHA-1 prefix.
+
+        :param prefix: The first 5 characters of an uppercase SHA-1 hash.
+        :return: The raw response body.
+        """
+        response = self.session.get(f"{self.api_url}{prefix}", headers=HEADERS, timeout=self.timeout)
+
+        hook = get_metrics_hook()
+        if hook is not None:
+            hook.count("hibp.requests")
+            # urllib3 records every retry it made in the history of the final Retry
+            history = getattr(getattr(response.raw, "retries", None), "history", None)
+            if isinstance(history, tuple) and history:
+                hook.count("hibp.retries", len(history))
 
         if response.status_code != 200:
             raise Exception(
@@ -47,26 +146,170 @@ def hibp_validator(password: str) -> ValidationResult:
                 f"Status: {response.status_code}, Details: {response.text}"
             )
 
-        lines = response.text.splitlines()
+        return response.content
 
-        found = any(
-            line.split(":")[0].strip() == suffix and int(line.split(":")[1].strip()) > 0
-            for line in lines
-        )
+    def range_suffixes(self, prefix: str) -> frozenset[str]:
+        """
+        Returns the breached suffixes for a prefix, from the cache when possible.
 
-        if found:
-            return ValidationResult(
-                is_valid=False,
-                errors=["Password has been compromised in a data breach."]
-            )
+        :param prefix: The first 5 characters of an uppercase SHA-1 hash.
+        :return: The breached hash suffixes.
+        """
+        if self.cache is not None:
+            suffixes = self.cache.get(prefix)
+            hook = get_metrics_hook()
+            if hook is not None:
+                hook.count("hibp.cacheHits" if suffixes is not None else "hibp.cacheMisses")
+            if suffixes is not None:
+                return suffixes
+
+        suffixes = parse_range(self.fetch_range(prefix))
+        if self.cache is not None:
+            self.cache.put(prefix, suffixes)
+        return suffixes
+
+    def check(self, password: str) -> ValidationResult:
+        """
+        Checks if the given password has been exposed in a data breach.
+
+        :param password: The password to check.
+        :return: ValidationResult indicating if the password has been compromised.
+        """
+        try:
+            hook = get_metrics_hook()
+            start = time.perf_counter() if hook is not None else 0.0
+
+            sha1 = generate_sha1(password)
+            prefix = sha1[:5]
+            suffix = sha1[5:]
+
+            if hook is not None:
+                hashed = time.perf_counter()
+                hook.timing("hibp.sha1", hashed - start)
+
+            if self.cache is not None:
+                found = suffix in self.range_suffixes(prefix)
+            else:
+                found = suffix_in_range(self.fetch_range(prefix), suffix)
 
-        return ValidationResult(is_valid=True, errors=[])
+            if hook is not None:
+                hook.timing("hibp.lookup", time.perf_counter() - hashed)
+
+            if found:
+                return ValidationResult(
+                    is_valid=False,
+                    errors=["Password has been compromised in a data breach."]
+                )
+
+            return ValidationResult(is_valid=True, errors=[])
+
+        except Exception as error:
+            error_message = str(error)
+            print(f"Error during password breach check: {error_message}")
+            raise RuntimeError(f"HaveIBeenPwned check failed: {error_message}")
+
+
+_default_client: HIBPClient | None = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> HIBPClient:
+    """
+    Returns the shared client used by `hibp_validator`, creating it on first use.
+
+    :return: The shared HIBPClient.
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = HIBPClient()
+    return _default_client
+
+
+def hibp_validator(password: str, client: HIBPClient | None = None) -> ValidationResult:
+    """
+    Checks if the given password has been exposed in a data breach.
+
+    :param password: The password to check.
+    :param client: The client to use, such as an HIBPClient or an offline store
+        (hibp_offline.OfflineHIBPStore). Defaults to the shared online client.
+    :return: ValidationResult indicating if the password has been compromised.
+    """
+    hook = get_metrics_hook()
+    if hook is None:
+        return (client if client is not None else get_default_client()).check(password)
+
+    start = time.perf_counter()
+    try:
+        return (client if client is not None else get_default_client()).check(password)
+    finally:
+        hook.timing("hibp.check", time.perf_counter() - start)
+
+
+def hibp_check_many(
+    passwords: Iterable[str],
+    client: HIBPClient | None = None,
+    max_in_flight: int = 10
+) -> list[ValidationResult]:
+    """
+    Checks many passwords, fetching each distinct SHA-1 prefix range only once.
+
+    Passwords are grouped by their 5-character prefix; every range is fetched
+    and parsed into a set once, with at most `max_in_flight` requests running
+    concurrently. Ranges are submitted as earlier ones complete, so only a
+    few requests per worker are queued at a time, however many prefixes
+    there are.
+
+    :param passwords: The passwords to check.
+    :param client: The client to use. Defaults to the shared client.
+    :param max_in_flight: Maximum number of concurrent range requests.
+    :return: One ValidationResult per password, in input order.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1.")
+    client = client if client is not None else get_default_client()
+
+    hashes = [generate_sha1(password) for password in passwords]
+    indexes_by_prefix: dict[str, list[int]] = {}
+    for index, sha1 in enumerate(hashes):
+        indexes_by_prefix.setdefault(sha1[:5], []).append(index)
+
+    results: list[ValidationResult | None] = [None] * len(hashes)
+    executor = ThreadPoolExecutor(max_workers=max_in_flight)
+    try:
+        prefixes = iter(indexes_by_prefix)
+        # Two requests per worker keep every worker busy without queuing all prefixes
+        pending = {
+            executor.submit(client.range_suffixes, prefix): prefix
+            for prefix in islice(prefixes, max_in_flight * 2)
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                suffixes = future.result()
+                for index in indexes_by_prefix[pending.pop(future)]:
+                    if hashes[index][5:] in suffixes:
+                        results[index] = ValidationResult(
+                            is_valid=False,
+                            errors=["Password has been compromised in a data breach."]
+                        )
+                    else:
+                        results[index] = ValidationResult(is_valid=True, errors=[])
+            for prefix in islice(prefixes, len(done)):
+                pending[executor.submit(client.range_suffixes, prefix)] = prefix
 
     except Exception as error:
+        executor.shutdown(wait=False, cancel_futures=True)
         error_message = str(error)
         print(f"Error during password breach check: {error_message}")
         raise RuntimeError(f"HaveIBeenPwned check failed: {error_message}")
 
+    executor.shutdown()
+    return results
+
 
 # Example usage:
 if __name__ == "__main__":
@@ -0,0 +1,247 @@
+# src\hibp_async.py
+import asyncio
+import time
+import weakref
+
+from hibp import (
+    API_URL,
+    HEADERS,
+    RETRY_STATUSES,
+    ValidationResult,
+    generate_sha1,
+    suffix_in_range,
+)
+from hibp_cache import RangeCache, parse_range
+from metrics import get_metrics_hook
+
+
+class AsyncHIBPClient:
+    """
+    Asyncio client for the HaveIBeenPwned range API, built on aiohttp.
+
+    Connections are pooled and kept alive, requests time out, and 429/5xx
+    responses and connection errors are retried with exponential backoff.
+    Concurrent lookups of the same prefix share one in-flight request. The
+    aiohttp session is created on first use and belongs to the event loop
+    that was running then.
+
+    :param api_url: Base URL of the range API.
+    :param pool_size: Maximum number of pooled connections.
+    :param connect_timeout: Seconds to wait for a connection.
+    :param read_timeout: Seconds to wait for a response.
+    :param retries: Number of retries on 429/5xx responses and connection errors.
+    :param backoff_factor: Backoff between retries, in seconds, doubled after each retry.
+    :param cache: Optional cache of parsed range responses, keyed by prefix.
+    """
+
+    def __init__(
+        self,
+        api_url: str = API_URL,
+        pool_size: int = 10,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10.0,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        cache: RangeCache | None = None
+    ):
+        self.api_url = api_url
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.cache = cache
+        self._session = None
+        self._in_flight: dict[str, asyncio.Task] = {}
+
+    async def _get_session(self):
+        if self._session is None:
+            import aiohttp  # Optional dependency, only needed by the async client
+
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout),
+                headers=HEADERS
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Closes the pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "AsyncHIBPClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _fetch_range(self, prefix: str) -> bytes:
+        import aiohttp
+
+        session = await self._get_session()
+        hook = get_metrics_hook()
+        if hook is not None:
+            hook.count("hibp.requests")
+        attempt = 0
+        while True:
+            if attempt and hook is not None:
+                hook.count("hibp.retries")
+            try:
+                async with session.get(f"{self.api_url}{prefix}") as response:
+                    body = await response.read()
+                    if response.status == 200:
+                        return body
+                    if response.status not in RETRY_STATUSES or attempt >= self.retries:
+                        raise Exception(
+                            f"Failed to check password against HaveIBeenPwned API. "
+                            f"Status: {response.status}, Details: {body.decode('utf-8', 'replace')}"
+                        )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= self.retries:
+                    raise
+            await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+            attempt += 1
+
+    async def fetch_range(self, prefix: str) -> bytes:
+        """
+        Fetches the range of hash suffixes sharing a 5-character SHA-1 prefix.
+
+        Callers asking for a prefix that is already being fetched wait for
+        that request instead of sending their own.
+
+        :param prefix: The first 5 characters of an uppercase SHA-1 hash.
+        :return: The raw response body.
+        """
+        task = self._in_flight.get(prefix)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_range(prefix))
+            self._in_flight[prefix] = task
+
+            def forget(done: asyncio.Task) -> None:
+                if self._in_flight.get(prefix) is done:
+                    del self._in_flight[prefix]
+
+            task.add_done_callback(forget)
+
+        # Shielded so one cancelled caller does not cancel the shared request
+        return await asyncio.shield(task)
+
+    async def range_suffixes(self, prefix: str) -> frozenset[str]:
+        """
+        Returns the breached suffixes for a prefix, from the cache when possible.
+
+        :param prefix: The first 5 characters of an uppercase SHA-1 hash.
+        :return: The breached hash suffixes.
+        """
+        if self.cache is not None:
+            suffixes = self.cache.get(prefix)
+            hook = get_metrics_hook()
+            if hook is not None:
+                hook.count("hibp.cacheHits" if suffixes is not None else "hibp.cacheMisses")
+            if suffixes is not None:
+                return suffixes
+
+        suffixes = parse_range(await self.fetch_range(prefix))
+        if self.cache is not None:
+            self.cache.put(prefix, suffixes)
+        return suffixes
+
+    async def check(self, password: str) -> ValidationResult:
+        """
+        Checks if the given password has been exposed in a data breach.
+
+        :param password: The password to check.
+        :return: ValidationResult indicating if the password has been compromised.
+        """
+        try:
+            hook = get_metrics_hook()
+            start = time.perf_counter() if hook is not None else 0.0
+
+            sha1 = generate_sha1(password)
+            prefix = sha1[:5]
+            suffix = sha1[5:]
+
+            if hook is not None:
+                hashed = time.perf_counter()
+                hook.timing("hibp.sha1", hashed - start)
+
+            if self.cache is not None:
+                found = suffix in await self.range_suffixes(prefix)
+            else:
+                found = suffix_in_range(await self.fetch_range(prefix), suffix)
+
+            if hook is not None:
+                hook.timing("hibp.lookup", time.perf_counter() - hashed)
+
+            if found:
+                return ValidationResult(
+                    is_valid=False,
+                    errors=["Password has been compromised in a data breach."]
+                )
+
+            return ValidationResult(is_valid=True, errors=[])
+
+        except Exception as error:
+            error_message = str(error)
+            print(f"Error during password breach check: {error_message}")
+            raise RuntimeError(f"HaveIBeenPwned check failed: {error_message}")
+
+
+# One shared client per event loop, since aiohttp sessions are bound to their loop. Each
+# is kept with the generator that closes it when the loop shuts down.
+_default_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple]" = weakref.WeakKeyDictionary()
+
+
+async def _close_at_shutdown(loop: asyncio.AbstractEventLoop, client: AsyncHIBPClient):
+    # Parked at its yield; the loop closes it in shutdown_asyncgens(), which asyncio.run() calls
+    try:
+        yield
+    finally:
+        _default_clients.pop(loop, None)
+        await client.close()
+
+
+def get_default_async_client() -> AsyncHIBPClient:
+    """
+    Returns the shared async client of the running event loop, creating it on first use.
+
+    The client is closed when the loop shuts down its async generators, as
+    `asyncio.run()` does. Loops that are closed without
+    `loop.shutdown_asyncgens()` must `await get_default_async_client().close()`
+    themselves.
+
+    :return: The shared AsyncHIBPClient.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _default_clients.get(loop)
+    if entry is None:
+        client = AsyncHIBPClient()
+        closer = _close_at_shutdown(loop, client)
+        # Advances it to the yield, which registers it with the running loop
+        try:
+            closer.asend(None).send(None)
+        except StopIteration:
+            pass
+        entry = _default_clients[loop] = (client, closer)
+    return entry[0]
+
+
+async def hibp_validator_async(password: str, client: AsyncHIBPClient | None = None) -> ValidationResult:
+    """
+    Checks if the given password has been exposed in a data breach, without blocking the event loop.
+
+    :param password: The password to check.
+    :param client: The client to use. Defaults to the shared client of the running loop.
+    :return: ValidationResult indicating if the password has been compromised.
+    """
+    hook = get_metrics_hook()
+    if hook is None:
+        return await (client or get_default_async_client()).check(password)
+
+    start = time.perf_counter()
+    try:
+        return await (client or get_default_async_client()).check(password)
+    finally:
+        hook.timing("hibp.check", time.perf_counter() - start)
@@ -0,0 +1,165 @@
+# src\hibp_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+
+def parse_range(body: bytes) -> frozenset[str]:
+    """
+    Parses a range response into the set of suffixes with a non-zero count.
+
+    Padding entries (count 0) and malformed lines are skipped.
+
+    :param body: The raw range response body.
+    :return: The breached hash suffixes, uppercase.
+    """
+    suffixes = set()
+    for line in body.splitlines():
+        if line.endswith(b":0"):
+            continue  # Padding
+        suffix, separator, count = line.partition(b":")
+        if not separator:
+            continue
+        try:
+            if int(count) > 0:
+                suffixes.add(suffix.strip().decode("ascii").upper())
+        except (ValueError, UnicodeDecodeError):
+            continue
+    return frozenset(suffixes)
+
+
+class RangeCache:
+    """
+    In-process LRU cache of parsed HIBP range responses, keyed by SHA-1 prefix.
+
+    Entries expire `ttl` seconds after they were fetched. With `disk_path`,
+    entries are also written to a SQLite file, so they survive restarts; the
+    disk tier is consulted on a memory miss and obeys the same TTL. A cache
+    can be shared between threads.
+
+    :param max_entries: Maximum number of prefixes kept in memory.
+    :param ttl: Seconds an entry stays valid.
+    :param disk_path: Optional path of the SQLite file backing the cache.
+    :param clock: Returns the current time in seconds. Defaults to time.time.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl: float = 3600.0,
+        disk_path: str | None = None,
+        clock: Callable[[], float] = time.time
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        # prefix -> (fetched_at, suffixes), least recently used first
+        self._entries: OrderedDict[str, tuple[float, frozenset[str]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._disk = None
+        if disk_path is not None:
+            import sqlite3  # Only needed by the disk tier
+
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS ranges "
+                "(prefix TEXT PRIMARY KEY, fetched_at REAL NOT NULL, suffixes TEXT NOT NULL)"
+            )
+            self._disk.commit()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, prefix: str) -> frozenset[str] | None:
+        """
+        Returns the cached suffixes for `prefix`, or None on a miss.
+
+        :param prefix: The 5-character SHA-1 prefix.
+        :return: The breached suffixes, or None.
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(prefix)
+            if entry is not None:
+                if now - entry[0] < self.ttl:
+                    self._entries.move_to_end(prefix)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[prefix]
+
+            if self._disk is not None:
+                row = self._disk.execute(
+                    "SELECT fetched_at, suffixes FROM ranges WHERE prefix = ?", (prefix,)
+                ).fetchone()
+                if row is not None and now - row[0] < self.ttl:
+                    suffixes = frozenset(row[1].split()) if row[1] else frozenset()
+                    self._remember(prefix, row[0], suffixes)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return suffixes
+
+            self.misses += 1
+            return None
+
+    def put(self, prefix: str, suffixes: frozenset[str]) -> None:
+        """
+        Stores the parsed suffixes of a freshly fetched range.
+
+        :param prefix: The 5-character SHA-1 prefix.
+        :param suffixes: The breached suffixes, as returned by parse_range.
+        """
+        now = self.clock()
+        with self._lock:
+            self._remember(prefix, now, suffixes)
+            if self._disk is not None:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO ranges (prefix, fetched_at, suffixes) VALUES (?, ?, ?)",
+                    (prefix, now, "\n".join(sorted(suffixes)))
+                )
+                self._disk.commit()
+
+    def _remember(self, prefix: str, fetched_at: float, suffixes: frozenset[str]) -> None:
+        self._entries[prefix] = (fetched_at, suffixes)
+        self._entries.move_to_end(prefix)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drops every entry, in memory and on disk, and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.disk_hits = 0
+            if self._disk is not None:
+                self._disk.execute("DELETE FROM ranges")
+                self._disk.commit()
+
+    def close(self) -> None:
+        """Closes the disk tier, if any."""
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        :return: Hits, misses, disk hits, hit rate and current size.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "diskHits": self.disk_hits,
+                "hitRate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+            }
@@ -0,0 +1,231 @@
+# src\hibp_offline.py
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from typing import Iterable
+
+from hibp import ValidationResult
+from utils.bloom_filter import BlockedBloomFilter
+
+MAGIC = b"HIBPSHA1"
+HEADER = struct.Struct(">8sQ")  # magic, record count
+PREFIX_BITS = 20  # The 5 hex characters the range API is keyed by
+PREFIX_COUNT = 1 << PREFIX_BITS
+OFFSET = struct.Struct(">Q")
+DIGEST_SIZE = 20
+RECORD = struct.Struct(">20sI")  # SHA-1 digest, breach count
+
+# A filter saved next to a store is picked up automatically
+FILTER_SUFFIX = ".bloom"
+
+TABLE_START = HEADER.size
+RECORDS_START = TABLE_START + (PREFIX_COUNT + 1) * OFFSET.size
+
+
+def _parse_dump_lines(lines: Iterable[str]) -> Iterable[tuple[bytes, int]]:
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        hash_hex, _, count = line.partition(":")
+        try:
+            digest = bytes.fromhex(hash_hex)
+            count = int(count) if count else 1
+        except ValueError:
+            raise ValueError(f"Malformed line {line_number} in breach dump: {line!r}")
+        if len(digest) != DIGEST_SIZE:
+            raise ValueError(f"Line {line_number} is not a SHA-1 hash: {line!r}")
+        yield digest, count
+
+
+def build_offline_store(source_path: str, target_path: str, encoding: str = "ascii") -> int:
+    """
+    Converts a Pwned Passwords SHA-1 dump into the compact binary store.
+
+    The dump must be the "ordered by hash" download: one `HASH:COUNT` line
+    per hash, sorted. It is streamed, so it is never held in memory. The
+    store holds a header, a table of 2^20 + 1 record offsets (one per 5-hex
+    prefix, plus an end marker) and the fixed-width records.
+
+    :param source_path: Path to the text dump.
+    :param target_path: Path of the binary store to write.
+    :param encoding: Encoding of the dump.
+    :return: The number of records written.
+    """
+    prefix_starts = [0] * (PREFIX_COUNT + 1)
+    count = 0
+    previous_digest = b""
+
+    with open(source_path, encoding=encoding) as source, open(target_path, "wb") as target:
+        # The header and offset table are rewritten once the records are known
+        target.write(b"\0" * RECORDS_START)
+
+        for digest, breaches in _parse_dump_lines(source):
+            if digest <= previous_digest:
+                raise ValueError("The breach dump must be sorted by hash without duplicates.")
+            previous_digest = digest
+
+            prefix = int.from_bytes(digest[:3], "big") >> 4
+            prefix_starts[prefix + 1] += 1
+            target.write(RECORD.pack(digest, min(breaches, 0xFFFFFFFF)))
+            count += 1
+
+        # Turn per-prefix record counts into running start offsets
+        for prefix in range(PREFIX_COUNT):
+            prefix_starts[prefix + 1] += prefix_starts[prefix]
+
+        target.seek(0)
+        target.write(HEADER.pack(MAGIC, count))
+        target.write(struct.pack(f">{PREFIX_COUNT + 1}Q", *prefix_starts))
+
+    return count
+
+
+def build_breach_filter(store_path: str, filter_path: str | None = None, false_positive_rate: float = 0.01) -> dict:
+    """
+    Builds a Bloom filter over every hash of a binary store and saves it.
+
+    :param store_path: Path to a store written by build_offline_store.
+    :param filter_path: Where to save the filter. Defaults to the store path plus FILTER_SUFFIX.
+    :param false_positive_rate: Target false-positive rate of the filter.
+    :return: Build statistics of the filter.
+    """
+    if filter_path is None:
+        filter_path = store_path + FILTER_SUFFIX
+
+    with OfflineHIBPStore(store_path, use_filter=False) as store:
+        bloom = BlockedBloomFilter.for_capacity(len(store), false_positive_rate)
+        for digest in store.digests():
+            bloom.add(digest)
+
+    bloom.save(filter_path)
+    return bloom.stats()
+
+
+class OfflineHIBPStore:
+    """
+    Breach lookups against a memory-mapped binary store built by `build_offline_store`.
+
+    Only the pages touched by a lookup are read from disk: one offset table
+    entry pair, then a binary search over the records sharing the hash's
+    5-hex prefix. With a Bloom filter (see build_breach_filter), most
+    passwords that were never breached are answered from memory without
+    touching the store. A store can be shared between threads, and pickles
+    by path, so the receiving process must be able to open the same files.
+
+    :param path: Path to the binary store.
+    :param filter_path: Path to a Bloom filter. Defaults to the store path plus FILTER_SUFFIX, if it exists.
+    :param use_filter: Set to False to always search the store.
+    """
+
+    def __init__(self, path: str, filter_path: str | None = None, use_filter: bool = True):
+        self.path = path
+        self.filter = None
+        self.filter_path = None
+        if use_filter:
+            if filter_path is None and os.path.exists(path + FILTER_SUFFIX):
+                filter_path = path + FILTER_SUFFIX
+            if filter_path is not None:
+                self.filter = BlockedBloomFilter.load(filter_path)
+                self.filter_path = filter_path
+
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.record_count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or len(self._map) != RECORDS_START + self.record_count * RECORD.size:
+            self._map.close()
+            raise ValueError(f"{path} is not an offline HIBP store.")
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    def __reduce__(self):
+        # The memory map cannot be pickled; the store is reopened from its path,
+        # e.g. in validate_many workers
+        return (OfflineHIBPStore, (self.path, self.filter_path, self.filter is not None))
+
+    def close(self) -> None:
+        """Unmaps the store."""
+        self._map.close()
+
+    def __enter__(self) -> "OfflineHIBPStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def digests(self) -> Iterable[bytes]:
+        """Yields every digest in the store, in sorted order."""
+        for index in range(self.record_count):
+            position = RECORDS_START + index * RECORD.size
+            yield self._map[position:position + DIGEST_SIZE]
+
+    def breach_count(self, sha1: str) -> int:
+        """
+        Returns how often a hash was seen in breaches.
+
+        :param sha1: The SHA-1 hash, as 40 hex characters.
+        :return: The breach count, 0 if the hash is not in the store.
+        """
+        digest = bytes.fromhex(sha1)
+        if self.filter is not None and digest not in self.filter:
+            return 0  # Definitely not breached
+
+        prefix = int(sha1[:5], 16)
+        low = OFFSET.unpack_from(self._map, TABLE_START + prefix * OFFSET.size)[0]
+        high = OFFSET.unpack_from(self._map, TABLE_START + (prefix + 1) * OFFSET.size)[0]
+
+        records = self._map
+        while low < high:
+            middle = (low + high) // 2
+            position = RECORDS_START + middle * RECORD.size
+            candidate = records[position:position + DIGEST_SIZE]
+            if candidate < digest:
+                low = middle + 1
+            elif candidate > digest:
+                high = middle
+            else:
+                return RECORD.unpack_from(records, position)[1]
+        return 0
+
+    def check(self, password: str) -> ValidationResult:
+        """
+        Checks if the given password has been exposed in a data breach.
+
+        :param password: The password to check.
+        :return: ValidationResult indicating if the password has been compromised.
+        """
+        try:
+            sha1 = hashlib.sha1(password.encode('utf-8')).hexdigest()
+            if self.breach_count(sha1) > 0:
+                return ValidationResult(
+                    is_valid=False,
+                    errors=["Password has been compromised in a data breach."]
+                )
+            return ValidationResult(is_valid=True, errors=[])
+
+        except Exception as error:
+            error_message = str(error)
+            print(f"Error during password breach check: {error_message}")
+            raise RuntimeError(f"HaveIBeenPwned check failed: {error_message}")
+
+
+_stores: dict[str, OfflineHIBPStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_offline_store(path: str) -> OfflineHIBPStore:
+    """
+    Returns a shared store for `path`, opening it on first use.
+
+    :param path: Path to the binary store.
+    :return: The shared OfflineHIBPStore.
+    """
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = OfflineHIBPStore(path)
+        return store
@@ -0,0 +1,117 @@
+# src\metrics.py
+import threading
+
+
+class MetricsHook:
+    """
+    Receives timings and counters from the validators.
+
+    Subclass it and override the methods to forward the measurements to a
+    metrics backend, then install it with `set_metrics_hook`. Without a hook
+    installed the validators skip all measuring.
+
+    Timings reported:
+        stage.<name>: Duration of a `validate_password` stage (length, blocklist, hibp).
+        blocklist.compile: Normalizing and indexing a plain list blocklist.
+        blocklist.check: Matching a password against a compiled blocklist.
+        hibp.check: Duration of `hibp_validator`, online or offline.
+        hibp.sha1: Hashing the password.
+        hibp.lookup: Getting the range of the hash prefix, from the cache or the network.
+
+    Counters reported:
+        blocklist.termsScanned: Terms visited after bucket and q-gram pruning.
+        blocklist.termsPruned: Terms skipped without being visited.
+        blocklist.levenshteinCalls: Term-to-password distance computations by the matching engine.
+        hibp.cacheHits, hibp.cacheMisses: Range cache lookups.
+        hibp.requests, hibp.retries: Range requests sent, and retries among them.
+    """
+
+    def timing(self, name: str, seconds: float) -> None:
+        """Records one duration, in seconds."""
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Adds `value` to a counter."""
+
+
+class InMemoryMetrics(MetricsHook):
+    """
+    Metrics hook that aggregates everything in memory, for tests and benchmarks.
+
+    Safe to share between threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # name -> [count, total seconds, max seconds]
+        self._timings: dict[str, list] = {}
+        self._counters: dict[str, int] = {}
+
+    def timing(self, name: str, seconds: float) -> None:
+        with self._lock:
+            entry = self._timings.get(name)
+            if entry is None:
+                self._timings[name] = [1, seconds, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                entry[2] = max(entry[2], seconds)
+
+    def count(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def counter(self, name: str) -> int:
+        """Returns the current value of a counter, 0 if it was never reported."""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def reset(self) -> None:
+        """Drops every timing and counter."""
+        with self._lock:
+            self._timings.clear()
+            self._counters.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns the aggregated measurements.
+
+        Returns:
+            dict: `timings` maps each name to its count, total, mean and max
+            seconds; `counters` maps each name to its value.
+        """
+        with self._lock:
+            return {
+                "timings": {
+                    name: {
+                        "count": count,
+                        "totalSeconds": total,
+                        "meanSeconds": total / count,
+                        "maxSeconds": longest,
+                    }
+                    for name, (count, total, longest) in self._timings.items()
+                },
+                "counters": dict(self._counters),
+            }
+
+
+_hook: MetricsHook | None = None
+
+
+def get_metrics_hook() -> MetricsHook | None:
+    """Returns the installed metrics hook, or None when metrics are disabled."""
+    return _hook
+
+
+def set_metrics_hook(hook: MetricsHook | None) -> MetricsHook | None:
+    """
+    Installs the process-wide metrics hook; None disables metrics.
+
+    Args:
+        hook (MetricsHook | None): The hook to install.
+
+    Returns:
+        MetricsHook | None: The previously installed hook.
+    """
+    global _hook
+    previous, _hook = _hook, hook
+    return previous
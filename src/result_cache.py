@@ -0,0 +1,139 @@
+# src\result_cache.py
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from config import ValidationOptions, ValidationResult
+
+
+class ResultCache:
+    """
+    Opt-in LRU cache of `validate_password` results.
+
+    Passwords are never stored: entries are keyed by an HMAC-SHA256 of the
+    password, under a key that only lives in this process, together with a
+    fingerprint of the options and pipeline. Results of options with
+    `hibpCheck` expire after `hibp_ttl` seconds, since breach data changes;
+    the others stay valid until evicted. Every entry records the blocklist
+    version it was computed with, so entries of options whose blocklist was
+    updated with `add` or `remove` (even during the validation) are dropped
+    on lookup. A cache can be shared between threads.
+
+    :param max_entries: Maximum number of results kept.
+    :param hibp_ttl: Seconds a result that includes a breach check stays valid.
+    :param secret: HMAC key. Defaults to 32 random bytes.
+    :param clock: Returns the current time in seconds. Defaults to time.monotonic.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        hibp_ttl: float = 300.0,
+        secret: bytes | None = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+
+        self.max_entries = max_entries
+        self.hibp_ttl = hibp_ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+        self._secret = secret if secret is not None else os.urandom(32)
+        # (fingerprint, password digest) -> (blocklist version, expires_at or None, isValid, errors),
+        # least recently used first
+        self._entries: OrderedDict[tuple, tuple[int, float | None, bool, tuple[str, ...]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, password: str, options: ValidationOptions, fingerprint: Hashable = ()) -> tuple:
+        """
+        Returns the cache key of a password under compiled options.
+
+        The key captures the current blocklist version: take it before
+        validating, so a result computed while the blocklist changed is
+        stored under the version it may predate.
+
+        :param password: The password.
+        :param options: The compiled options it is validated with.
+        :param fingerprint: Anything else the result depends on, such as the check stages.
+        :return: The key to pass to `get` and `put`.
+        """
+        version = getattr(options.blocklist, 'version', 0)
+        digest = hmac.new(self._secret, password.encode('utf-8'), hashlib.sha256).digest()
+        return (options, fingerprint), digest, version
+
+    def get(self, key: tuple) -> ValidationResult | None:
+        """
+        Returns the cached result for `key`, or None on a miss.
+
+        :param key: A key from `key`.
+        :return: A copy of the cached result, or None.
+        """
+        fingerprint, digest, version = key
+        with self._lock:
+            entry = self._entries.get((fingerprint, digest))
+            if entry is not None:
+                stored_version, expires_at, is_valid, errors = entry
+                if stored_version != version:
+                    # Computed before a blocklist update
+                    del self._entries[fingerprint, digest]
+                    self.invalidations += 1
+                elif expires_at is None or self.clock() < expires_at:
+                    self._entries.move_to_end((fingerprint, digest))
+                    self.hits += 1
+                    return ValidationResult(isValid=is_valid, errors=list(errors))
+                else:
+                    del self._entries[fingerprint, digest]
+            self.misses += 1
+            return None
+
+    def put(self, key: tuple, result: ValidationResult) -> None:
+        """
+        Stores the result of a validation.
+
+        :param key: A key from `key`.
+        :param result: The result to cache.
+        """
+        fingerprint, digest, version = key
+        options = fingerprint[0]
+        expires_at = self.clock() + self.hibp_ttl if options.hibpCheck else None
+        with self._lock:
+            stored = self._entries.get((fingerprint, digest))
+            if stored is not None and stored[0] > version:
+                return  # A result computed after a later blocklist update is already there
+            self._entries[fingerprint, digest] = (version, expires_at, result.isValid, tuple(result.errors))
+            self._entries.move_to_end((fingerprint, digest))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drops every entry and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.invalidations = 0
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        :return: Hits, misses, hit rate, invalidations and current size.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+            }
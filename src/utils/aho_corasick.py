@@ -0,0 +1,116 @@
+# src\utils\aho_corasick.py
+import sys
+from array import array
+from typing import Iterable
+
+
+class AhoCorasick:
+    """
+    Multi-pattern exact matcher.
+
+    The automaton is built once from the patterns; `find_all` then reports
+    every pattern occurring in a text with a single pass over it. The
+    automaton is read-only after construction.
+
+    The trie is stored flat, nodes numbered breadth-first: the edges of node
+    n are the characters `labels[edge_start[n]:edge_start[n + 1]]`, and edge
+    e leads to node e + 1. The per-node tables are integer arrays. The trie
+    is built level by level from the sorted patterns, so construction never
+    holds more than these arrays and the pattern list; an automaton pickles
+    to a string and a few raw buffers and unpickles without rebuilding
+    anything.
+
+    Args:
+        patterns (Iterable[str]): The patterns to match. A pattern's id is its position.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        words = list(patterns)
+        # Sorting is stable, so equal patterns keep their ids in increasing order
+        ids = sorted(range(len(words)), key=words.__getitem__)
+        words.sort()
+
+        # Node numbers and pattern ids fit 32-bit arrays unless the patterns are huge
+        typecode = 'i' if sum(map(len, words)) + len(words) < 1 << 31 else 'q'
+        edge_start = array(typecode, [0])
+        labels = []
+        # Pattern id ending at a node, or -1
+        pattern_at = array(typecode)
+
+        # Every node of the current depth is the range of sorted patterns sharing its prefix
+        depth = 0
+        level_start, level_stop = array(typecode, [0]), array(typecode, [len(words)])
+        while level_start:
+            next_start, next_stop = array(typecode), array(typecode)
+            for low, high in zip(level_start, level_stop):
+                # Patterns ending here sort before their extensions, and are all equal
+                pattern_at.append(ids[low] if low < high and len(words[low]) == depth else -1)
+                while low < high and len(words[low]) == depth:
+                    low += 1
+                while low < high:
+                    char = words[low][depth]
+                    child_start = low
+                    while low < high and words[low][depth] == char:
+                        low += 1
+                    labels.append(char)
+                    next_start.append(child_start)
+                    next_stop.append(low)
+                edge_start.append(len(labels))
+            level_start, level_stop = next_start, next_stop
+            depth += 1
+
+        self.labels = ''.join(labels)
+        self.edge_start = edge_start
+        self.pattern_at = pattern_at
+        # failure: longest proper suffix of a node's string that is also a node;
+        # output_link: nearest node on the failure chain that ends a pattern, or -1
+        self.failure, self.output_link = self._build_links(self.labels, edge_start, pattern_at, typecode)
+
+    @staticmethod
+    def _build_links(labels: str, edge_start: array, pattern_at: array, typecode: str) -> tuple[array, array]:
+        node_count = len(pattern_at)
+        failure = array(typecode, [0]) * node_count
+        output_link = array(typecode, [-1]) * node_count
+
+        # Breadth-first numbering puts every node after the shallower nodes its links point to
+        for parent in range(node_count):
+            for edge in range(edge_start[parent], edge_start[parent + 1]):
+                child = edge + 1
+                char = labels[edge]
+                fallback = failure[parent]
+                target = labels.find(char, edge_start[fallback], edge_start[fallback + 1])
+                while target < 0 and fallback:
+                    fallback = failure[fallback]
+                    target = labels.find(char, edge_start[fallback], edge_start[fallback + 1])
+                target = target + 1 if target >= 0 and target + 1 != child else 0
+                failure[child] = target
+                output_link[child] = target if pattern_at[target] != -1 else output_link[target]
+
+        return failure, output_link
+
+    def nbytes(self) -> int:
+        """Returns the bytes used by the edge labels and the per-node arrays."""
+        return sys.getsizeof(self.labels) + sum(
+            sys.getsizeof(table) for table in (self.edge_start, self.pattern_at, self.failure, self.output_link)
+        )
+
+    def find_all(self, text: str) -> set[int]:
+        """Returns the ids of all patterns that occur in `text`."""
+        found = set()
+        labels, edge_start = self.labels, self.edge_start
+        failure, pattern_at, output_link = self.failure, self.pattern_at, self.output_link
+        node = 0
+
+        for char in text:
+            edge = labels.find(char, edge_start[node], edge_start[node + 1])
+            while edge < 0 and node:
+                node = failure[node]
+                edge = labels.find(char, edge_start[node], edge_start[node + 1])
+            node = edge + 1 if edge >= 0 else 0
+
+            match = node if pattern_at[node] != -1 else output_link[node]
+            while match > 0 and pattern_at[match] not in found:
+                found.add(pattern_at[match])
+                match = output_link[match]
+
+        return found
@@ -0,0 +1,166 @@
+# src\utils\bloom_filter.py
+import math
+import struct
+
+MAGIC = b"BLOCKBLM"
+HEADER = struct.Struct(">8sQQBd")  # magic, block count, entries, hash count, target false-positive rate
+BLOCK_BITS = 512  # One 64-byte cache line per block
+BLOCK_BYTES = BLOCK_BITS // 8
+POSITION_BITS = 9  # log2(BLOCK_BITS)
+MAX_HASHES = 10  # 12 digest bytes left after the block index give ten 9-bit positions
+
+
+def blocked_false_positive_rate(entries: int, block_count: int, hash_count: int) -> float:
+    """
+    False-positive rate of a blocked Bloom filter holding `entries` keys.
+
+    Keys pick their block at random, so the load of a block follows a
+    Poisson distribution with mean entries / block_count. The rate is that
+    of a single 512-bit block, averaged over its load: overloaded blocks
+    dominate it at low rates, which the unblocked formula misses.
+
+    :param entries: Number of keys added.
+    :param block_count: Number of 512-bit blocks.
+    :param hash_count: Number of bits set per key.
+    :return: The expected false-positive rate.
+    """
+    if entries <= 0:
+        return 0.0
+    mean = entries / block_count
+    bit_miss = 1 - 1 / BLOCK_BITS
+    # Loads further than 12 standard deviations from the mean have a negligible probability
+    spread = 12 * math.sqrt(mean) + 30
+    rate = 0.0
+    for load in range(max(1, int(mean - spread)), int(mean + spread) + 1):
+        probability = math.exp(load * math.log(mean) - mean - math.lgamma(load + 1))
+        rate += probability * (1 - bit_miss ** (hash_count * load)) ** hash_count
+    return rate
+
+
+class BlockedBloomFilter:
+    """
+    Blocked Bloom filter over uniformly distributed digests, such as SHA-1.
+
+    All bits of a key live in one 512-bit block, so a lookup touches a single
+    cache line. Keys are already uniform, so the block and the bit positions
+    are read straight from the digest: the first 8 bytes pick the block and
+    the following bytes give 9-bit positions inside it.
+
+    :param block_count: Number of 512-bit blocks.
+    :param hash_count: Number of bits set per key, at most 10.
+    :param false_positive_rate: The rate the filter was sized for, kept for reporting.
+    """
+
+    def __init__(self, block_count: int, hash_count: int, false_positive_rate: float = 0.0):
+        if block_count < 1:
+            raise ValueError("A Bloom filter needs at least one block.")
+        if not 1 <= hash_count <= MAX_HASHES:
+            raise ValueError(f"hash_count must be between 1 and {MAX_HASHES}.")
+
+        self.block_count = block_count
+        self.hash_count = hash_count
+        self.false_positive_rate = false_positive_rate
+        self.entries = 0
+        self.bits = bytearray(block_count * BLOCK_BYTES)
+
+    @classmethod
+    def for_capacity(cls, entries: int, false_positive_rate: float) -> "BlockedBloomFilter":
+        """
+        Sizes a filter for `entries` keys at the given false-positive rate.
+
+        The size is the smallest block count, with the best hash count for
+        it, at which `blocked_false_positive_rate` meets the target; the
+        classic unblocked formula is only the starting point of the search,
+        as blocking and the hash count cap both raise the real rate.
+
+        :param entries: Expected number of keys.
+        :param false_positive_rate: Target false-positive rate, between 0 and 1.
+        :return: An empty filter.
+        """
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate must be between 0 and 1.")
+        entries = max(entries, 1)
+
+        def best(block_count: int) -> tuple[float, int]:
+            return min(
+                (blocked_false_positive_rate(entries, block_count, hash_count), hash_count)
+                for hash_count in range(1, MAX_HASHES + 1)
+            )
+
+        # The unblocked optimum needs the fewest bits, so it is a lower bound
+        bit_count = -entries * math.log(false_positive_rate) / math.log(2) ** 2
+        low = high = max(1, math.ceil(bit_count / BLOCK_BITS))
+        while best(high)[0] > false_positive_rate:
+            low, high = high + 1, high * 2
+        while low < high:
+            middle = (low + high) // 2
+            if best(middle)[0] > false_positive_rate:
+                low = middle + 1
+            else:
+                high = middle
+        return cls(high, best(high)[1], false_positive_rate)
+
+    def _positions(self, digest: bytes) -> tuple[int, list[int]]:
+        block = int.from_bytes(digest[:8], "big") % self.block_count
+        rest = int.from_bytes(digest[8:20], "big")
+        positions = [(rest >> (POSITION_BITS * i)) & (BLOCK_BITS - 1) for i in range(self.hash_count)]
+        return block * BLOCK_BYTES, positions
+
+    def add(self, digest: bytes) -> None:
+        """Adds a 20-byte digest."""
+        base, positions = self._positions(digest)
+        bits = self.bits
+        for position in positions:
+            bits[base + (position >> 3)] |= 1 << (position & 7)
+        self.entries += 1
+
+    def __contains__(self, digest: bytes) -> bool:
+        """False means the digest was definitely never added."""
+        base, positions = self._positions(digest)
+        bits = self.bits
+        for position in positions:
+            if not bits[base + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+    def estimated_false_positive_rate(self) -> float:
+        """Estimates the false-positive rate for the keys added so far."""
+        return blocked_false_positive_rate(self.entries, self.block_count, self.hash_count)
+
+    def stats(self) -> dict:
+        """
+        Returns build statistics.
+
+        :return: Entries, size, hash count and target and estimated false-positive rates.
+        """
+        return {
+            "entries": self.entries,
+            "bytes": len(self.bits),
+            "bitsPerEntry": len(self.bits) * 8 / self.entries if self.entries else 0.0,
+            "hashCount": self.hash_count,
+            "targetFalsePositiveRate": self.false_positive_rate,
+            "estimatedFalsePositiveRate": self.estimated_false_positive_rate(),
+        }
+
+    def save(self, path: str) -> None:
+        """Writes the filter to `path`."""
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, self.block_count, self.entries, self.hash_count, self.false_positive_rate))
+            file.write(self.bits)
+
+    @classmethod
+    def load(cls, path: str) -> "BlockedBloomFilter":
+        """Reads a filter written by `save` into memory."""
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+            if len(header) != HEADER.size:
+                raise ValueError(f"{path} is not a Bloom filter file.")
+            magic, block_count, entries, hash_count, false_positive_rate = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a Bloom filter file.")
+
+            bloom = cls(block_count, hash_count, false_positive_rate)
+            if file.readinto(bloom.bits) != len(bloom.bits):
+                raise ValueError(f"{path} is truncated.")
+            bloom.entries = entries
+            return bloom
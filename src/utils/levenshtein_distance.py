@@ -16,4 +16,48 @@ def levenshtein_distance(a: str, b: str) -> int:
                                    matrix[i][j - 1] + 1,      # Insertion
                                    matrix[i - 1][j - 1] + cost)  # Substitution
 
-    return matrix[len(a)][len(b)]
\ No newline at end of file
+    return matrix[len(a)][len(b)]
+
+def levenshtein_within(a: str, b: str, k: int) -> bool:
+    """
+    Check whether the Levenshtein distance between two strings is at most k.
+
+    Only the diagonal band of width 2k+1 is computed, using two rolling rows,
+    and the scan stops as soon as every cell in the band exceeds k.
+    """
+    len_a, len_b = len(a), len(b)
+    if k < 0 or abs(len_a - len_b) > k:
+        return False
+
+    too_far = k + 1  # Any value above k is as good as infinity
+    previous = [j if j <= k else too_far for j in range(len_b + 1)]
+    current = [too_far] * (len_b + 1)
+
+    for i in range(1, len_a + 1):
+        low = max(1, i - k)
+        high = min(len_b, i + k)
+        char_a = a[i - 1]
+
+        # Left edge of the band: column 0, or a cell outside the band
+        current[low - 1] = i if low == 1 else too_far
+        row_min = current[low - 1]
+
+        for j in range(low, high + 1):
+            cost = 0 if char_a == b[j - 1] else 1
+            value = min(previous[j] + 1,          # Deletion
+                        current[j - 1] + 1,       # Insertion
+                        previous[j - 1] + cost)   # Substitution
+            current[j] = value
+            if value < row_min:
+                row_min = value
+
+        # Right edge of the band, read as the previous row on the next pass
+        if high < len_b:
+            current[high + 1] = too_far
+
+        if row_min > k:
+            return False
+
+        previous, current = current, previous
+
+    return previous[len_b] <= k
@@ -0,0 +1,67 @@
+# src\utils\myers.py
+
+def pattern_bitmasks(pattern: str) -> dict[str, int]:
+    """Map every character of `pattern` to a bitmask of the positions it occupies."""
+    bitmasks = {}
+    for position, char in enumerate(pattern):
+        bitmasks[char] = bitmasks.get(char, 0) | (1 << position)
+    return bitmasks
+
+
+def approximate_substring_within(
+    text: str,
+    pattern: str,
+    k: int,
+    bitmasks: dict[str, int] | None = None
+) -> bool:
+    """
+    Check whether any substring of `text` is within k edits of `pattern`.
+
+    Uses the search variant of Myers' bit-parallel algorithm: one pass over
+    `text` keeps the last row of the edit-distance matrix as bit-vectors, so
+    substrings of every length are considered at once. Python integers are
+    unbounded, so patterns longer than a machine word need no blocking.
+
+    Args:
+        text (str): The text to search in.
+        pattern (str): The pattern to search for.
+        k (int): Maximum number of edits allowed.
+        bitmasks (dict[str, int] | None): Precomputed `pattern_bitmasks(pattern)`.
+
+    Returns:
+        bool: True if some substring of `text` is within k edits of `pattern`.
+    """
+    m = len(pattern)
+    if m <= k:
+        return k >= 0  # Deleting the whole pattern is within budget
+    if bitmasks is None:
+        bitmasks = pattern_bitmasks(pattern)
+
+    mask = (1 << m) - 1
+    high_bit = 1 << (m - 1)
+    vertical_positive = mask
+    vertical_negative = 0
+    score = m
+
+    for char in text:
+        equal = bitmasks.get(char, 0)
+        x_vertical = equal | vertical_negative
+        x_horizontal = (((equal & vertical_positive) + vertical_positive) ^ vertical_positive) | equal
+
+        horizontal_positive = vertical_negative | (~(x_horizontal | vertical_positive) & mask)
+        horizontal_negative = vertical_positive & x_horizontal
+
+        if horizontal_positive & high_bit:
+            score += 1
+        elif horizontal_negative & high_bit:
+            score -= 1
+        if score <= k:
+            return True
+
+        # Search variant: the top row stays 0, so nothing is shifted in
+        horizontal_positive = (horizontal_positive << 1) & mask
+        horizontal_negative = (horizontal_negative << 1) & mask
+        vertical_positive = horizontal_negative | (~(x_vertical | horizontal_positive) & mask)
+        vertical_negative = horizontal_positive & x_vertical
+
+    return False
@@ -0,0 +1,128 @@
+# src\utils\numpy_levenshtein.py
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+else:
+    ndarray = object  # Keeps the annotations resolvable without importing NumPy
+
+# NumPy is optional and slow to import, so it is only loaded once the numpy engine is used
+_np = None
+_np_checked = False
+
+# Upper bound on (term, window) pairs scored at once, to cap temporary memory
+MAX_PAIRS_PER_BATCH = 1 << 16
+
+
+def _numpy():
+    """Imports NumPy on first use; returns the module, or None if it is not installed."""
+    global _np, _np_checked
+    if not _np_checked:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:  # Callers fall back to the pure-Python kernel
+            pass
+        _np_checked = True
+    return _np
+
+
+def numpy_available() -> bool:
+    """Returns True if NumPy could be imported."""
+    return _numpy() is not None
+
+
+def encode(text: str) -> "ndarray":
+    """Encodes a string as an array of Unicode code points."""
+    np = _numpy()
+    return np.fromiter(map(ord, text), dtype=np.int32, count=len(text))
+
+
+def encode_terms(terms: list[str], length: int) -> "ndarray":
+    """Encodes same-length terms as a (len(terms), length) code-point array."""
+    np = _numpy()
+    codes = np.empty((len(terms), length), dtype=np.int32)
+    for row, term in enumerate(terms):
+        codes[row] = encode(term)
+    return codes
+
+
+def batch_levenshtein(a: "ndarray", b: "ndarray") -> "ndarray":
+    """
+    Computes the Levenshtein distance of many string pairs at once.
+
+    The DP matrix is filled anti-diagonal by anti-diagonal: every cell of an
+    anti-diagonal only depends on the two previous ones, so a whole
+    anti-diagonal of every pair is computed with a handful of array operations.
+
+    Args:
+        a (np.ndarray): (pairs, len_a) code points of the first strings.
+        b (np.ndarray): (pairs, len_b) code points of the second strings.
+
+    Returns:
+        np.ndarray: (pairs,) distances.
+    """
+    np = _numpy()
+    pairs, len_a = a.shape
+    len_b = b.shape[1]
+    too_far = len_a + len_b + 1
+
+    # Diagonals are indexed by the row i of the cell (i, d - i)
+    before_previous = np.full((pairs, len_a + 1), too_far, dtype=np.int32)
+    previous = np.full((pairs, len_a + 1), too_far, dtype=np.int32)
+    previous[:, 0] = 0
+
+    for d in range(1, len_a + len_b + 1):
+        current = np.full((pairs, len_a + 1), too_far, dtype=np.int32)
+        low = max(1, d - len_b)
+        high = min(len_a, d - 1)
+
+        if low <= high:
+            rows = np.arange(low, high + 1)
+            cost = (a[:, rows - 1] != b[:, d - rows - 1]).astype(np.int32)
+            current[:, low:high + 1] = np.minimum(
+                np.minimum(previous[:, low - 1:high] + 1,        # Deletion
+                           previous[:, low:high + 1] + 1),       # Insertion
+                before_previous[:, low - 1:high] + cost          # Substitution
+            )
+        if d <= len_b:
+            current[:, 0] = d
+        if d <= len_a:
+            current[:, d] = d
+
+        before_previous, previous = previous, current
+
+    return previous[:, len_a]
+
+
+def blocked_term_rows(terms: "ndarray", password: "ndarray", k: int) -> "ndarray":
+    """
+    Finds the terms with a password window of the same length within k edits.
+
+    Args:
+        terms (np.ndarray): (n, length) code points of same-length terms.
+        password (np.ndarray): Code points of the lowercased password.
+        k (int): Maximum number of edits allowed.
+
+    Returns:
+        np.ndarray: Sorted row numbers of the blocked terms.
+    """
+    np = _numpy()
+    count, length = terms.shape
+    if count == 0 or len(password) < length:
+        return np.empty(0, dtype=np.intp)
+
+    windows = np.lib.stride_tricks.sliding_window_view(password, length)
+    window_count = len(windows)
+    blocked = np.zeros(count, dtype=bool)
+
+    terms_per_batch = max(1, MAX_PAIRS_PER_BATCH // window_count)
+    for start in range(0, count, terms_per_batch):
+        chunk = terms[start:start + terms_per_batch]
+        distances = batch_levenshtein(
+            np.repeat(chunk, window_count, axis=0),
+            np.tile(windows, (len(chunk), 1))
+        ).reshape(len(chunk), window_count)
+        blocked[start:start + len(chunk)] = (distances <= k).any(axis=1)
+
+    return np.flatnonzero(blocked)
@@ -0,0 +1,73 @@
+# src\utils\qgram_index.py
+import sys
+from array import array
+from collections import Counter
+from typing import Iterable
+
+
+def qgrams(text: str, q: int) -> Counter:
+    """Counts the overlapping substrings of length q in `text`."""
+    return Counter(text[i:i + q] for i in range(len(text) - q + 1))
+
+
+def qgram_lower_bound(length: int, k: int, q: int) -> int:
+    """
+    Minimum number of q-grams a text must share with a pattern of `length`
+    characters to contain a substring within k edits of it (the q-gram lemma).
+
+    Every edit destroys at most q of the pattern's q-grams, so at least
+    `length - q + 1 - k * q` of them survive. A bound of zero or less means
+    the pattern cannot be pruned.
+    """
+    return length - q + 1 - k * q
+
+
+class QGramIndex:
+    """
+    Inverted index from q-gram to the terms containing it.
+
+    Args:
+        terms (Iterable[str]): The indexed terms. A term's id is its position.
+        q (int): The q-gram length. Default is 2.
+    """
+
+    def __init__(self, terms: Iterable[str], q: int = 2):
+        if q < 1:
+            raise ValueError("q-gram size must be at least 1.")
+
+        self.q = q
+        # q-gram -> (ids of the terms containing it, its occurrences in each of them);
+        # compact arrays, so the index pickles and unpickles as raw buffers
+        self.postings: dict[str, tuple[array, array]] = {}
+
+        for term_id, term in enumerate(terms):
+            for gram, count in qgrams(term, q).items():
+                posting = self.postings.get(gram)
+                if posting is None:
+                    posting = self.postings[gram] = (array('I'), array('I'))
+                posting[0].append(term_id)
+                posting[1].append(count)
+
+    def nbytes(self) -> int:
+        """Returns the bytes used by the postings, their q-gram keys and the dict holding them."""
+        return sys.getsizeof(self.postings) + sum(
+            sys.getsizeof(gram) + sys.getsizeof(term_ids) + sys.getsizeof(counts)
+            for gram, (term_ids, counts) in self.postings.items()
+        )
+
+    def shared_counts(self, text: str) -> dict[int, int]:
+        """
+        Counts, for every term sharing a q-gram with `text`, how many q-gram
+        occurrences they have in common (as a multiset intersection).
+        """
+        shared: dict[int, int] = {}
+        postings = self.postings
+
+        for gram, text_count in qgrams(text, self.q).items():
+            posting = postings.get(gram)
+            if posting is None:
+                continue
+            for term_id, term_count in zip(*posting):
+                shared[term_id] = shared.get(term_id, 0) + min(term_count, text_count)
+
+        return shared
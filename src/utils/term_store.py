@@ -0,0 +1,115 @@
+# src\utils\term_store.py
+import gzip
+from array import array
+from typing import Iterable, Iterator
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def read_lines(path: str, encoding: str = "utf-8", errors: str = "strict") -> Iterator[str]:
+    """
+    Streams the lines of a text file, or of a gzip-compressed one, without their line endings.
+
+    Compression is detected from the file's magic bytes, so the file name does not matter.
+
+    Args:
+        path (str): Path to the file.
+        encoding (str): Text encoding. Default is 'utf-8'.
+        errors (str): How to handle undecodable bytes, as in `open`. Default is 'strict'.
+
+    Yields:
+        str: One line at a time.
+    """
+    with open(path, "rb") as raw:
+        compressed = raw.read(2) == GZIP_MAGIC
+
+    opener = gzip.open if compressed else open
+    with opener(path, "rt", encoding=encoding, errors=errors, newline="") as file:
+        for line in file:
+            yield line.rstrip("\r\n")
+
+
+class TermStore:
+    """
+    Read-only sequence of strings packed into a single UTF-8 buffer.
+
+    Term i is `buffer[offsets[i]:offsets[i + 1]]`, decoded on access. Terms
+    are grouped by character length, shortest first, so that every length
+    forms one contiguous run (see `runs`). Compared with a tuple of `str`,
+    this drops the ~50 bytes of per-object overhead of every term.
+
+    Build instances with `from_terms`.
+    """
+
+    def __init__(self, buffer: bytes, offsets: array, runs: tuple[tuple[int, int, int], ...]):
+        self.buffer = buffer
+        self.offsets = offsets
+        self._runs = runs
+
+    @classmethod
+    def from_terms(cls, terms: Iterable[str]) -> "TermStore":
+        """
+        Packs terms, dropping duplicates and keeping the first occurrence of each.
+
+        Terms are consumed as a stream and appended to one buffer per length,
+        so only the terms of a single length are ever held as objects, while
+        that length's duplicates are dropped.
+
+        Args:
+            terms (Iterable[str]): The terms, already normalized.
+
+        Returns:
+            TermStore: The packed terms.
+        """
+        # length -> (packed UTF-8 bytes, end offset of every term)
+        pending: dict[int, tuple[bytearray, array]] = {}
+        for term in terms:
+            buffer, ends = pending.setdefault(len(term), (bytearray(), array("Q")))
+            buffer += term.encode("utf-8")
+            ends.append(len(buffer))
+
+        buffer = bytearray()
+        offsets = [0]
+        runs = []
+        for length in sorted(pending):
+            chunk, ends = pending.pop(length)
+            start = 0
+            unique = {}
+            for end in ends:
+                unique.setdefault(bytes(chunk[start:end]), None)
+                start = end
+            del chunk, ends
+
+            first = len(offsets) - 1
+            for encoded in unique:
+                buffer += encoded
+                offsets.append(len(buffer))
+            runs.append((length, first, len(offsets) - 1))
+
+        typecode = "I" if len(buffer) < 1 << 32 else "Q"
+        return cls(bytes(buffer), array(typecode, offsets), tuple(runs))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("term index out of range")
+        return self.buffer[self.offsets[index]:self.offsets[index + 1]].decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        buffer, offsets = self.buffer, self.offsets
+        for index in range(len(self)):
+            yield buffer[offsets[index]:offsets[index + 1]].decode("utf-8")
+
+    def runs(self) -> tuple[tuple[int, int, int], ...]:
+        """Returns (length, start, stop) for every run of same-length terms, shortest first."""
+        return self._runs
+
+    def nbytes(self) -> int:
+        """Returns the bytes used by the packed buffer and the offset array."""
+        return len(self.buffer) + self.offsets.itemsize * len(self.offsets)
@@ -1,10 +1,25 @@
 # nist_password_validator/validator.py
 
-from .utils.levenshtein_distance import levenshtein_distance
-from .config import ValidationOptions, ValidationResult
-from .hibp import HIBPChecker
+import time
+from operator import attrgetter
+from typing import Awaitable, Callable, Iterable, NamedTuple
 
-def validate_password(password: str, options: ValidationOptions) -> ValidationResult:
+from blocklist_validator import blocklist_validator
+from config import ValidationOptions, ValidationResult, blocklist_options, resolve_hibp_client
+from metrics import get_metrics_hook
+from result_cache import ResultCache
+
+class CheckStage(NamedTuple):
+    """One check of the validation pipeline; stages run cheapest first."""
+    name: str
+    cost: float
+    enabled: Callable[[ValidationOptions], bool]
+    run: Callable[[str, ValidationOptions], list]
+    # Non-blocking variant used by validate_password_async if the check does I/O;
+    # it also receives the async HIBP client passed to validate_password_async
+    run_async: Callable[[str, ValidationOptions, object], Awaitable[list]] | None = None
+
+def check_length(password: str, options: ValidationOptions) -> list:
     errors = []
 
     # Check minimum length
@@ -15,19 +30,133 @@ def validate_password(password: str, options: ValidationOptions) -> ValidationRe
     if options.maxLength and len(password) > options.maxLength:
         errors.append(f"Password must be no more than {options.maxLength} characters long.")
 
-    # Check blocklist
-    if options.blocklist:
-        errors.extend(check_blocklist(password, options.blocklist, options.fuzzyToleranceValue))
+    return errors
+
+def check_blocklist(password: str, options: ValidationOptions) -> list:
+    # The blocklist may be a list or a CompiledBlocklist
+    return blocklist_validator(password, options.blocklist, blocklist_options(options))["errors"]
+
+def check_hibp(password: str, options: ValidationOptions) -> list:
+    # The HIBP modules are imported on first use, so importing the validator stays cheap
+    from hibp import hibp_validator
+    return hibp_validator(password, resolve_hibp_client(options)).errors
+
+async def check_hibp_async(password: str, options: ValidationOptions, client=None) -> list:
+    if options.hibpClient is not None or options.hibpOfflinePath:
+        # The client or offline store chosen by the options wins over the online async client
+        import asyncio
+        import inspect
+        configured = resolve_hibp_client(options)
+        if inspect.iscoroutinefunction(configured.check):
+            return (await configured.check(password)).errors
+        from hibp_offline import OfflineHIBPStore
+        if isinstance(configured, OfflineHIBPStore):
+            return configured.check(password).errors
+        # A blocking client such as HIBPClient runs off the event loop
+        return (await asyncio.to_thread(configured.check, password)).errors
+
+    from hibp_async import hibp_validator_async
+    return (await hibp_validator_async(password, client)).errors
+
+DEFAULT_STAGES = (
+    CheckStage("length", 1, lambda options: bool(options.minLength or options.maxLength), check_length),
+    CheckStage("blocklist", 10, lambda options: bool(options.blocklist), check_blocklist),
+    CheckStage("hibp", 1000, lambda options: bool(options.hibpCheck), check_hibp, check_hibp_async),
+)
+
+def _should_stop(errors: list, options: ValidationOptions) -> bool:
+    """Trims `errors` to the error limit and tells whether the pipeline is done."""
+    error_limit = options.errorLimit if options.errorLimit is not None else float('inf')
+    if len(errors) >= error_limit:
+        del errors[error_limit:]
+        return True
+    return bool(options.failFast and errors)
+
+def validate_password(
+    password: str,
+    options: ValidationOptions,
+    stages: Iterable[CheckStage] = DEFAULT_STAGES,
+    cache: ResultCache | None = None
+) -> ValidationResult:
+    """
+    Runs the enabled check stages, cheapest first.
+
+    In full-report mode (the default) every stage runs. With `failFast`, the
+    pipeline stops after the first stage that reports an error, so a password
+    that is too short never reaches the HIBP network call. Either way it stops
+    once `errorLimit` errors have been collected.
 
-    # Check HIBP
-    if options.hibpCheck and HIBPChecker.check_password(password):
-        errors.append("Password has been compromised in a data breach.")
+    With a `result_cache.ResultCache`, a password validated again under the
+    same options and stages is answered from the cache.
+    """
+    options = options.compile()
+    if cache is not None:
+        stages = tuple(stages)
+        key = cache.key(password, options, stages)
+        result = cache.get(key)
+        if result is None:
+            result = validate_password(password, options, stages)
+            cache.put(key, result)
+        return result
+
+    errors = []
+    hook = get_metrics_hook()
+
+    for stage in sorted(stages, key=attrgetter('cost')):
+        if not stage.enabled(options):
+            continue
+        if hook is None:
+            errors.extend(stage.run(password, options))
+        else:
+            start = time.perf_counter()
+            errors.extend(stage.run(password, options))
+            hook.timing(f'stage.{stage.name}', time.perf_counter() - start)
+        if _should_stop(errors, options):
+            break
 
     return ValidationResult(isValid=len(errors) == 0, errors=errors)
 
-def check_blocklist(password: str, blocklist: list, fuzzy_tolerance: int) -> list:
-    return [
-        f"Password is too similar to the blocked password: {blocked}"
-        for blocked in blocklist
-        if levenshtein_distance(password, blocked) <= fuzzy_tolerance
-    ]
\ No newline at end of file
+async def validate_password_async(
+    password: str,
+    options: ValidationOptions,
+    hibp_client=None,
+    stages: Iterable[CheckStage] = DEFAULT_STAGES,
+    cache: ResultCache | None = None
+) -> ValidationResult:
+    """
+    Async variant of `validate_password` for asyncio servers.
+
+    The pipeline is the same; stages with a `run_async` variant, such as the
+    breach check, are awaited instead of blocking the event loop. The breach
+    check uses the `hibpClient` or offline store of the options when they
+    set one, and otherwise `hibp_client` (an `AsyncHIBPClient`) or the shared
+    client of the running loop. The
+    optional `cache` works as in `validate_password`.
+    """
+    options = options.compile()
+    if cache is not None:
+        stages = tuple(stages)
+        key = cache.key(password, options, stages)
+        result = cache.get(key)
+        if result is None:
+            result = await validate_password_async(password, options, hibp_client, stages)
+            cache.put(key, result)
+        return result
+
+    errors = []
+    hook = get_metrics_hook()
+
+    for stage in sorted(stages, key=attrgetter('cost')):
+        if not stage.enabled(options):
+            continue
+        start = time.perf_counter() if hook is not None else 0.0
+        if stage.run_async is not None:
+            errors.extend(await stage.run_async(password, options, hibp_client))
+        else:
+            errors.extend(stage.run(password, options))
+        if hook is not None:
+            hook.timing(f'stage.{stage.name}', time.perf_counter() - start)
+        if _should_stop(errors, options):
+            break
+
+    return ValidationResult(isValid=len(errors) == 0, errors=errors)
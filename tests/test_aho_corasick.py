@@ -0,0 +1,33 @@
+# tests\test_aho_corasick.py
+from utils.aho_corasick import AhoCorasick
+
+
+def test_finds_all_patterns():
+    matcher = AhoCorasick(["he", "she", "his", "hers"])
+    assert matcher.find_all("ushers") == {0, 1, 3}
+    assert matcher.find_all("ahishers") == {0, 1, 2, 3}
+
+
+def test_no_matches():
+    matcher = AhoCorasick(["password", "qwerty"])
+    assert matcher.find_all("correcthorse") == set()
+    assert matcher.find_all("") == set()
+
+
+def test_overlapping_and_nested_patterns():
+    matcher = AhoCorasick(["a", "aa", "aaa", "b"])
+    assert matcher.find_all("aa") == {0, 1}
+    assert matcher.find_all("xaaab") == {0, 1, 2, 3}
+
+
+def test_unicode_patterns():
+    matcher = AhoCorasick(["пароль", "🔑"])
+    assert matcher.find_all("мойпароль🔑") == {0, 1}
+
+
+def test_agrees_with_substring_search():
+    patterns = ["ab", "bab", "bca", "c", "caa", "abcab"]
+    matcher = AhoCorasick(patterns)
+    for text in ["abccab", "babcabca", "aaaa", "cabcabcaa"]:
+        expected = {i for i, pattern in enumerate(patterns) if pattern in text}
+        assert matcher.find_all(text) == expected
@@ -0,0 +1,38 @@
+# tests\test_batch.py
+import pytest
+from batch import validate_many
+from config import ValidationOptions
+from validator import validate_password
+
+options = ValidationOptions(minLength=8, blocklist=["password", "qwerty"])
+passwords = ["short", "mypassword1", "correct horse battery", "qwerty123", "Tr0ub4dor&3"] * 7
+
+
+def as_tuples(results):
+    return [(result.isValid, result.errors) for result in results]
+
+
+@pytest.mark.parametrize("workers, chunk_size", [(1, 1000), (2, 1), (2, 4), (3, 1000)])
+def test_results_in_input_order(workers, chunk_size):
+    expected = as_tuples(validate_password(password, options) for password in passwords)
+    results = validate_many(passwords, options, workers=workers, chunk_size=chunk_size)
+    assert as_tuples(results) == expected
+
+
+def test_consumes_input_lazily():
+    consumed = []
+
+    def generate():
+        for i in range(10_000):
+            consumed.append(i)
+            yield f"candidate{i}"
+
+    results = validate_many(generate(), options, workers=2, chunk_size=10)
+    next(results)
+    assert len(consumed) < 10_000
+    results.close()
+
+
+def test_invalid_chunk_size():
+    with pytest.raises(ValueError):
+        list(validate_many(passwords, options, chunk_size=0))
@@ -0,0 +1,60 @@
+# tests\test_bloom_filter.py
+import hashlib
+import pytest
+from utils.bloom_filter import BlockedBloomFilter
+
+
+def digest(i: int) -> bytes:
+    return hashlib.sha1(str(i).encode()).digest()
+
+
+def test_no_false_negatives_and_bounded_false_positives():
+    bloom = BlockedBloomFilter.for_capacity(5000, 0.01)
+    for i in range(5000):
+        bloom.add(digest(i))
+
+    assert all(digest(i) in bloom for i in range(5000))
+    false_positives = sum(digest(i) in bloom for i in range(5000, 25000))
+    assert false_positives / 20000 < 0.03
+
+    stats = bloom.stats()
+    assert stats["entries"] == 5000
+    assert stats["targetFalsePositiveRate"] == 0.01
+    assert 0 < stats["estimatedFalsePositiveRate"] < 0.03
+
+
+def test_reported_rate_matches_measured_rate():
+    bloom = BlockedBloomFilter.for_capacity(20000, 0.001)
+    for i in range(20000):
+        bloom.add(digest(i))
+
+    probes = 200000
+    measured = sum(digest(i) in bloom for i in range(20000, 20000 + probes)) / probes
+    estimated = bloom.stats()["estimatedFalsePositiveRate"]
+    assert estimated <= 0.001
+    # About 200 false positives are expected, so 30% is over four standard deviations
+    assert 0.7 * measured < estimated < 1.3 * measured
+    assert measured < 0.0013
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "filter.bloom")
+    bloom = BlockedBloomFilter.for_capacity(100, 0.001)
+    for i in range(100):
+        bloom.add(digest(i))
+    bloom.save(path)
+
+    loaded = BlockedBloomFilter.load(path)
+    assert loaded.bits == bloom.bits
+    assert loaded.stats() == bloom.stats()
+
+
+def test_invalid_parameters(tmp_path):
+    with pytest.raises(ValueError):
+        BlockedBloomFilter.for_capacity(100, 1.5)
+    with pytest.raises(ValueError):
+        BlockedBloomFilter(1, 11)
+    path = tmp_path / "garbage.bloom"
+    path.write_bytes(b"garbage")
+    with pytest.raises(ValueError):
+        BlockedBloomFilter.load(str(path))
@@ -0,0 +1,84 @@
+# tests\test_cli.py
+import gzip
+import io
+import json
+
+import pytest
+from cli import main
+
+
+def run(argv, stdin=""):
+    stdout, stderr = io.StringIO(), io.StringIO()
+    status = main(argv, stdin=io.StringIO(stdin), stdout=stdout, stderr=stderr)
+    return status, [json.loads(line) for line in stdout.getvalue().splitlines()], stderr.getvalue()
+
+
+def test_reads_stdin_and_writes_jsonl():
+    status, records, summary = run(["--min-length", "8", "--echo-password"], "password1\nshort\r\n")
+    assert status == 1
+    assert records == [
+        {"line": 1, "isValid": True, "errors": [], "password": "password1"},
+        {"line": 2, "isValid": False, "errors": ["Password must be at least 8 characters long."],
+         "password": "short"},
+    ]
+    assert "validated 2 passwords (1 invalid)" in summary
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reads_file_with_blocklist(tmp_path, workers):
+    blocklist = tmp_path / "blocklist.txt.gz"
+    blocklist.write_bytes(gzip.compress(b"password\nqwerty\n"))
+    passwords = tmp_path / "passwords.txt"
+    passwords.write_text("".join(f"candidate{i}\n" for i in range(50)) + "qwerty123\n", encoding="utf-8")
+    output = tmp_path / "results.jsonl"
+
+    status, _, _ = run([str(passwords), "--blocklist", str(blocklist), "--workers", str(workers),
+                        "--batch-size", "7", "-o", str(output)])
+
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert status == 1
+    assert [record["line"] for record in records] == list(range(1, 52))
+    assert all(record["isValid"] for record in records[:50])
+    assert records[50]["errors"] == ['Password contains a substring too similar to: "qwerty".']
+    assert "password" not in records[0]
+
+
+def test_loads_blocklist_artifact(tmp_path):
+    from compiled_blocklist import CompiledBlocklist
+
+    artifact = str(tmp_path / "blocklist.bin")
+    CompiledBlocklist(["qwerty"]).save(artifact)
+    status, records, _ = run(["--blocklist", artifact], "qwerty123\nTr0ub4dor&3\n")
+    assert status == 1
+    assert [record["isValid"] for record in records] == [False, True]
+
+
+def test_all_valid_exits_zero():
+    status, records, _ = run([], "anything\n")
+    assert status == 0
+    assert records == [{"line": 1, "isValid": True, "errors": []}]
+
+
+def test_offline_mode_requires_store_path():
+    status, records, summary = run(["--hibp", "offline"], "password\n")
+    assert status == 2
+    assert records == []
+    assert "--hibp-offline-path" in summary
+
+
+def test_check_failure_exits_with_summary(tmp_path, monkeypatch):
+    import hibp
+
+    class UnreachableClient:
+        def check(self, password):
+            raise RuntimeError("HaveIBeenPwned check failed: connection refused")
+
+    monkeypatch.setattr(hibp, "get_default_client", UnreachableClient)
+    output = tmp_path / "results.jsonl"
+    status, _, errors = run(["--hibp", "online", "--min-length", "20", "--fail-fast", "-o", str(output)],
+                            "short\nlong enough to need the breach check\n")
+
+    assert status == 3
+    assert "error: HaveIBeenPwned check failed: connection refused" in errors
+    assert "validated 1 passwords (1 invalid)" in errors
+    assert [json.loads(line)["line"] for line in output.read_text(encoding="utf-8").splitlines()] == [1]
@@ -0,0 +1,308 @@
+# tests\test_compiled_blocklist.py
+import gzip
+import pytest
+from blocklist_validator import blocklist_validator
+from compiled_blocklist import CompiledBlocklist, LengthBucket
+
+
+def test_normalizes_and_dedupes_terms():
+    compiled = CompiledBlocklist(["  Password ", "password", "", "   ", "QWERTY"])
+    assert tuple(compiled.terms) == ("qwerty", "password")
+    assert len(compiled) == 2
+
+
+def test_length_buckets_with_precomputed_tolerances():
+    compiled = CompiledBlocklist(["password", "123456", "letmein1", "abc"], {"matchingSensitivity": 0.5})
+    assert tuple(compiled.terms) == ("abc", "123456", "password", "letmein1")
+    assert compiled.buckets == (
+        LengthBucket(3, 0, 1, 1),
+        LengthBucket(6, 1, 2, 3),
+        LengthBucket(8, 2, 4, 4),
+    )
+
+
+def test_buckets_longer_than_password_are_skipped():
+    compiled = CompiledBlocklist(["abcdefghij", "abc"])
+    calls = []
+    original = compiled.is_term_blocked
+    compiled.is_term_blocked = lambda *args: calls.append(args[1]) or original(*args)
+    assert compiled.check("abcdefghi")["errors"] == ['Password contains a substring too similar to: "abc".']
+    assert calls == []
+
+    # The Myers engine still reaches terms up to `tolerance` characters longer
+    myers = CompiledBlocklist(["abcdefghij"], {"engine": "myers"})
+    assert myers.bucket_can_match(myers.buckets[0], 8) is True
+    assert myers.bucket_can_match(myers.buckets[0], 7) is False
+    assert myers.check("abcdefghi")["isValid"] is False
+
+
+def test_check_matches_blocklist_validator():
+    blocklist = ["password", "123456", "qwerty"]
+    compiled = CompiledBlocklist(blocklist)
+    for password in ["myp@ssword123", "secureP@ssphrase123!", "qwerty!", ""]:
+        assert compiled.check(password) == blocklist_validator(password, blocklist)
+
+
+def test_compiled_instance_passed_to_blocklist_validator():
+    compiled = CompiledBlocklist(["password", "123", "myp"])
+    result = blocklist_validator("mypassword123", compiled, {"errorLimit": 2})
+    assert result["isValid"] is False
+    assert len(result["errors"]) == 2
+
+
+def test_empty_compiled_blocklist_is_valid():
+    assert blocklist_validator("anything", CompiledBlocklist([""])) == {"isValid": True, "errors": []}
+
+
+def test_from_file(tmp_path):
+    path = tmp_path / "blocklist.txt"
+    path.write_text("password\r\n  qwerty  \n\n", encoding="utf-8")
+    compiled = CompiledBlocklist.from_file(str(path))
+    assert tuple(compiled.terms) == ("qwerty", "password")
+    assert compiled.check("qwerty123")["isValid"] is False
+
+
+def test_from_gzip_file_reports_memory(tmp_path):
+    path = tmp_path / "blocklist.txt.gz"
+    path.write_bytes(gzip.compress(b"password\nqwerty\npassword\n"))
+    compiled = CompiledBlocklist.from_file(str(path))
+    assert tuple(compiled.terms) == ("qwerty", "password")
+
+    usage = compiled.memory_usage()
+    assert usage["terms"] == 2
+    assert usage["termBytes"] == compiled.terms.nbytes()
+    assert usage["exactMatcherBytes"] == compiled.exact_matcher.nbytes()
+    assert usage["qgramIndexBytes"] == compiled.qgram_index.nbytes()
+    assert usage["totalBytes"] > usage["termBytes"] + usage["exactMatcherBytes"] + usage["qgramIndexBytes"] - 1
+    assert usage["bytesPerTerm"] == usage["totalBytes"] / 2
+
+
+def test_memory_usage_tracks_retained_memory():
+    import random
+    import tracemalloc
+
+    rng = random.Random(0)
+    terms = ["".join(rng.choice("abcdefghij0123") for _ in range(rng.randint(4, 12))) for _ in range(1500)]
+    for engine in ("levenshtein", "myers"):
+        tracemalloc.start()
+        compiled = CompiledBlocklist(terms, {"engine": engine})
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        # Within a quarter of what the build actually left allocated
+        assert 0.75 * retained < compiled.memory_usage()["totalBytes"] <= 1.25 * retained
+
+
+@pytest.mark.parametrize("engine", ["levenshtein", "myers"])
+def test_save_and_load_artifact(tmp_path, engine):
+    path = str(tmp_path / "blocklist.bin")
+    compiled = CompiledBlocklist(["password", "qwerty", "пароль", "abc"], {"engine": engine, "maxEditDistance": 2})
+    compiled.save(path)
+
+    loaded = CompiledBlocklist.load(path)
+    assert tuple(loaded.terms) == tuple(compiled.terms)
+    assert loaded.buckets == compiled.buckets
+    assert loaded.engine == engine
+    for password in ["passw0rd!", "qwerty", "мойпароль", "xyz", "Tr0ub4dor&3"]:
+        assert loaded.check(password) == compiled.check(password)
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "blocklist.txt"
+    path.write_text("password\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        CompiledBlocklist.load(str(path))
+
+
+def test_custom_distance_calculator_sees_password():
+    seen = []
+
+    def calculator(term, password):
+        seen.append((term, password))
+        return 0
+
+    compiled = CompiledBlocklist(["Complete"], {"customDistanceCalculator": calculator})
+    assert compiled.buckets[0].tolerance is None
+    assert compiled.check("ComplexPass")["isValid"] is True
+    assert seen == [("complete", "ComplexPass")]
+
+
+@pytest.mark.parametrize("password, blocklist, options", [
+    ("secureP@ssphrase123!", ["password", "123456", "qwerty"], {}),
+    ("ComplexP@ss2024", ["password", "123456", "qwerty"], {}),
+    ("ComplexPass", ["Complete"], {"customDistanceCalculator": lambda term, password: len(term) // 6}),
+    ("myp@ssword123", ["password"], {}),
+    ("mypassword123", ["password", "123", "myp"], {}),
+    ("p@ssword", ["password"], {"matchingSensitivity": 0.5}),
+    ("mypassword", ["   password   "], {"trimWhitespace": False}),
+    ("пароль123", ["пароль"], {}),
+    ("a" * 1000, ["a" * 500], {}),
+])
+def test_myers_engine_agrees_with_sliding_window(password, blocklist, options):
+    window = CompiledBlocklist(blocklist, options).check(password)
+    myers = CompiledBlocklist(blocklist, {**options, "engine": "myers"}).check(password)
+    assert myers == window
+
+
+def test_myers_engine_matches_shorter_passwords():
+    # The sliding window never compares a term against a shorter password
+    assert CompiledBlocklist(["password"]).check("passwrd")["isValid"] is True
+    assert CompiledBlocklist(["password"], {"engine": "myers"}).check("passwrd")["isValid"] is False
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        CompiledBlocklist(["password"], {"engine": "nope"})
+
+
+def test_exact_hits_skip_fuzzy_scan():
+    compiled = CompiledBlocklist(["password", "qwerty", "zzzzzz"])
+    calls = []
+    original = compiled.is_term_blocked
+    compiled.is_term_blocked = lambda *args: calls.append(args[1]) or original(*args)
+
+    result = compiled.check("MyPassword1")
+    assert result["errors"] == ['Password contains a substring too similar to: "password".']
+    # "password" is an exact hit and the other terms are pruned before any scan
+    assert calls == []
+
+
+def test_qgram_index_prunes_distant_terms():
+    compiled = CompiledBlocklist(["password", "drowssap"])
+    calls = []
+    original = compiled.is_term_blocked
+    compiled.is_term_blocked = lambda *args: calls.append(args[1]) or original(*args)
+
+    # Shares characters with both terms, but only "password" has enough 2-grams
+    assert compiled.check("pa$sword")["isValid"] is False
+    assert calls == ["password"]
+
+
+@pytest.mark.parametrize("q", [1, 2, 3, 4])
+def test_qgram_pruning_keeps_verdicts(q):
+    blocklist = ["password", "123456", "qwerty", "letmein", "dragon", "aaaaaaaaaaaa"]
+    passwords = ["p@ssw0rd!", "qwertz99", "l3tme1n", "dragoon", "aaaaaaaaaaab", "123465", "xyz"]
+    for engine in ("levenshtein", "myers"):
+        pruned = CompiledBlocklist(blocklist, {"qgramSize": q, "engine": engine})
+        unpruned = CompiledBlocklist(blocklist, {"qgramSize": 1000, "engine": engine})
+        for password in passwords:
+            assert pruned.check(password) == unpruned.check(password)
+
+
+@pytest.mark.parametrize("options", [{}, {"matchingSensitivity": 0.5}, {"qgramSize": 1000}, {"maxEditDistance": 0}])
+def test_numpy_engine_agrees_with_levenshtein(options):
+    pytest.importorskip("numpy")
+    blocklist = ["password", "123456", "qwerty", "letmein", "dragon", "p@ss", "ab", "aaaaaaaaaaaa"]
+    passwords = ["p@ssw0rd!", "qwertz99", "l3tme1n", "dragoon", "aaaaaaaaaaab", "123465", "xyz", ""]
+    vectorized = CompiledBlocklist(blocklist, {**options, "engine": "numpy"})
+    assert vectorized.engine == "numpy"
+    pure = CompiledBlocklist(blocklist, options)
+    for password in passwords:
+        assert vectorized.check(password) == pure.check(password)
+
+
+def test_numpy_engine_falls_back_without_numpy(monkeypatch):
+    monkeypatch.setattr("compiled_blocklist.numpy_available", lambda: False)
+    compiled = CompiledBlocklist(["password"], {"engine": "numpy"})
+    assert compiled.engine == "levenshtein"
+    assert compiled.check("myp@ssword")["isValid"] is False
+
+
+def test_add_blocks_new_terms():
+    compiled = CompiledBlocklist(["password", "qwerty"])
+    assert compiled.add(["Dragon", "  PASSWORD ", ""]) == 1
+    assert compiled.add(["dragon"]) == 0
+    assert len(compiled) == 3
+    assert "DRAGON" in compiled
+    assert compiled.version == 1
+    assert compiled.check("mydragon!")["isValid"] is False
+
+
+def test_remove_unblocks_terms():
+    compiled = CompiledBlocklist(["password", "qwerty"])
+    compiled.add(["dragon"])
+    assert compiled.remove(["Password", "dragon", "missing"]) == 2
+    assert len(compiled) == 1
+    assert "password" not in compiled
+    assert compiled.check("password1")["isValid"] is True
+    assert compiled.check("dragon1")["isValid"] is True
+    assert compiled.check("qwerty1")["isValid"] is False
+
+    # Re-adding a removed term only lifts its tombstone
+    assert compiled.add(["password"]) == 1
+    assert compiled.check("password1")["isValid"] is False
+    assert compiled.version == 3
+
+
+def test_updates_keep_shortest_first_order_and_error_limit():
+    compiled = CompiledBlocklist(["abc", "letmein", "password123"])
+    compiled.add(["abcd1", "letmein1password123"])
+    password = "abcd1letmein1password123"
+    errors = compiled.check(password)["errors"]
+    terms = [error.split('"')[1] for error in errors]
+    assert terms == ["abc", "abcd1", "letmein", "password123", "letmein1password123"]
+
+    compiled.remove(["abc", "letmein"])
+    limited = compiled.check(password, 2)["errors"]
+    assert [error.split('"')[1] for error in limited] == ["abcd1", "password123"]
+
+
+def test_compact_folds_updates():
+    compiled = CompiledBlocklist(["password", "qwerty"])
+    compiled.add(["dragon"])
+    compiled.remove(["qwerty"])
+    compacted = compiled.compact()
+    assert tuple(compacted.terms) == ("dragon", "password")
+    assert compacted.version == 0
+    for password in ["dragon1", "qwerty1", "password1", "Tr0ub4dor&3"]:
+        assert compacted.check(password) == compiled.check(password)
+
+
+def test_updates_merge_into_few_runs():
+    compiled = CompiledBlocklist(["password"])
+    for i in range(1000):
+        compiled.add([f"term{i}"])
+        if i % 3 == 0:
+            compiled.remove([f"term{i // 2}"])
+    # Runs are merged by size class, so there are only about log2(updates) of them
+    assert len(compiled._overlay.runs) <= 11
+
+    compacted = compiled.compact()
+    assert len(compiled) == len(compacted) == len(set(compacted.terms))
+    for password in ["term0", "myterm500!", "term1", "term999x", "password1"]:
+        assert compiled.check(password) == compacted.check(password)
+
+
+def test_pickle_keeps_updates():
+    import pickle
+
+    compiled = CompiledBlocklist(["password"])
+    compiled.add(["dragon"])
+    restored = pickle.loads(pickle.dumps(compiled))
+    assert restored.check("dragon1")["isValid"] is False
+    assert restored.add(["qwerty"]) == 1
+
+
+def test_reads_do_not_block_during_updates():
+    import threading
+
+    compiled = CompiledBlocklist(["password"])
+    stop = threading.Event()
+    failures = []
+
+    def read():
+        while not stop.is_set():
+            if compiled.check("password1")["isValid"]:
+                failures.append("base term lost")
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for i in range(50):
+        compiled.add([f"term{i}"])
+        compiled.remove([f"term{i}"])
+    stop.set()
+    for reader in readers:
+        reader.join()
+
+    assert failures == []
+    assert compiled.version == 100
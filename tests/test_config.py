@@ -0,0 +1,116 @@
+# tests\test_config.py
+import pickle
+import pytest
+
+import config
+from compiled_blocklist import CompiledBlocklist
+from config import ValidationOptions, clear_compiled_options
+
+
+def test_options_are_immutable():
+    options = ValidationOptions(minLength=8)
+    with pytest.raises(AttributeError):
+        options.minLength = 4
+    with pytest.raises(AttributeError):
+        options.somethingElse = 1
+    assert options.replace(minLength=4).minLength == 4
+    assert options.minLength == 8
+
+
+def test_equal_options_are_hashable_and_equal():
+    first = ValidationOptions(minLength=8, blocklist=["password", "qwerty"])
+    second = ValidationOptions(minLength=8, blocklist=("password", "qwerty"))
+    assert first == second
+    assert hash(first) == hash(second)
+    assert first != first.replace(failFast=True)
+    assert len({first, second}) == 1
+
+
+def test_equal_options_share_one_compiled_instance():
+    first = ValidationOptions(minLength=8, blocklist=["password", "qwerty"])
+    second = ValidationOptions(minLength=8, blocklist=["password", "qwerty"])
+    compiled = first.compile()
+    assert compiled is second.compile()
+    assert compiled.compile() is compiled
+    assert isinstance(compiled.blocklist, CompiledBlocklist)
+    assert tuple(compiled.blocklist.terms) == ("qwerty", "password")
+
+    clear_compiled_options()
+    assert first.compile() is not compiled
+
+
+@pytest.mark.parametrize("settings", [
+    {"minLength": -1},
+    {"minLength": 10, "maxLength": 8},
+    {"matchingSensitivity": -0.1},
+    {"maxEditDistance": -1},
+    {"errorLimit": 0},
+    {"matchingSensitivity": None},
+    {"maxEditDistance": None},
+    {"matchingSensitivity": "0.25"},
+    {"maxEditDistance": True},
+    {"errorLimit": 2.5},
+])
+def test_compile_validates_settings(settings):
+    with pytest.raises(ValueError):
+        ValidationOptions(**settings).compile()
+
+
+def test_compile_resolves_hibp_client():
+    client = object()
+    assert ValidationOptions(hibpCheck=True, hibpClient=client).compile().hibpClient is client
+    assert ValidationOptions(hibpCheck=False).compile().hibpClient is None
+    # The shared online client is only resolved by the check itself
+    assert ValidationOptions(hibpCheck=True).compile().hibpClient is None
+
+
+class PicklableClient:
+    def check(self, password):
+        raise AssertionError("not called")
+
+
+def test_pickle_keeps_caller_client():
+    compiled = ValidationOptions(minLength=8, blocklist=["password"], hibpCheck=True,
+                                 hibpClient=PicklableClient()).compile()
+    restored = pickle.loads(pickle.dumps(compiled))
+    assert isinstance(restored.hibpClient, PicklableClient)
+    assert restored.compile() is restored
+    assert tuple(restored.blocklist.terms) == ("password",)
+
+
+def test_registry_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(config, "MAX_COMPILED_OPTIONS", 3)
+    clear_compiled_options()
+    policies = [ValidationOptions(minLength=length, blocklist=["password"]) for length in range(5)]
+    compiled = [policy.compile() for policy in policies[:3]]
+    assert policies[0].compile() is compiled[0]  # Now the most recently used
+
+    policies[3].compile()
+    policies[4].compile()
+    assert len(config._registry) == 3
+    assert policies[0].compile() is compiled[0]
+    assert ValidationOptions(minLength=1, blocklist=["password"]).compile() is not compiled[1]
+    # Options that were compiled keep their compiled instance
+    assert policies[1].compile() is compiled[1]
+
+
+def test_held_policies_are_not_rebuilt_past_the_registry_size(monkeypatch):
+    built = []
+
+    class CountingBlocklist(CompiledBlocklist):
+        def __init__(self, *args, **kwargs):
+            built.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(config, "CompiledBlocklist", CountingBlocklist)
+    clear_compiled_options()
+    policies = [ValidationOptions(minLength=length, blocklist=["password", "qwerty"])
+                for length in range(config.MAX_COMPILED_OPTIONS + 10)]
+    compiled = [policy.compile() for policy in policies]
+    assert [policy.compile() for policy in policies] == compiled
+    assert all(policy.compile() is result for policy, result in zip(policies, compiled))
+    # The policies only differ in minLength, so they share one compiled blocklist
+    assert len(built) == 1
+    assert all(result.blocklist is built[0] for result in compiled)
+    assert policies[0].replace(maxEditDistance=2).compile().blocklist is not built[0]
+    clear_compiled_options()
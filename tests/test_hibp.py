@@ -1,12 +1,18 @@
 # tests\test_hibp.py
 # src\test_hibp.py
+import threading
+
 import pytest
 import requests
 from unittest.mock import patch, Mock
 
 from hibp import (
     generate_sha1,
+    get_default_client,
+    hibp_check_many,
     hibp_validator,
+    HIBPClient,
+    suffix_in_range,
     ValidationResult,
     API_URL
 )
@@ -46,6 +52,7 @@ def mock_response():
         response = Mock()
         response.status_code = status_code
         response.text = text
+        response.content = text.encode("utf-8")
         return response
     return _mock_response
 
@@ -58,7 +65,7 @@ def test_hibp_validator_safe_password(mock_response):
     # Mock response with no matches
     mock_resp = mock_response(200, f"1234567890:0\nABCDEF123:1")
     
-    with patch('requests.get', return_value=mock_resp) as mock_get:
+    with patch('requests.Session.get', return_value=mock_resp) as mock_get:
         result = hibp_validator(password)
         
         mock_get.assert_called_once_with(
@@ -66,7 +73,8 @@ def test_hibp_validator_safe_password(mock_response):
             headers={
                 "User-Agent": "NIST-password-validator-py",
                 "Add-Padding": "true"
-            }
+            },
+            timeout=(3.05, 10.0)
         )
         
         assert result.is_valid is True
@@ -81,7 +89,7 @@ def test_hibp_validator_compromised_password(mock_response):
     # Mock response with a match
     mock_resp = mock_response(200, f"{suffix}:123\nABCDEF123:1")
     
-    with patch('requests.get', return_value=mock_resp) as mock_get:
+    with patch('requests.Session.get', return_value=mock_resp) as mock_get:
         result = hibp_validator(password)
         
         assert result.is_valid is False
@@ -94,7 +102,7 @@ def test_hibp_validator_api_error(mock_response):
     # Mock failed response
     mock_resp = mock_response(500, "Internal Server Error")
     
-    with patch('requests.get', return_value=mock_resp) as mock_get:
+    with patch('requests.Session.get', return_value=mock_resp) as mock_get:
         with pytest.raises(RuntimeError) as exc_info:
             hibp_validator(password)
         
@@ -104,7 +112,7 @@ def test_hibp_validator_network_error():
     """Test handling of network errors"""
     password = "TestPassword123"
     
-    with patch('requests.get', side_effect=requests.ConnectionError("Network Error")):
+    with patch('requests.Session.get', side_effect=requests.ConnectionError("Network Error")):
         with pytest.raises(RuntimeError) as exc_info:
             hibp_validator(password)
         
@@ -117,7 +125,110 @@ def test_hibp_validator_malformed_response(mock_response):
     # Mock response with malformed data
     mock_resp = mock_response(200, "Invalid:Format:Extra\nAlsoInvalid")
     
-    with patch('requests.get', return_value=mock_resp) as mock_get:
+    with patch('requests.Session.get', return_value=mock_resp) as mock_get:
         result = hibp_validator(password)
         assert result.is_valid is True
-        assert result.errors == []
\ No newline at end of file
+        assert result.errors == []
+
+
+def test_default_client_is_shared():
+    """Test that hibp_validator reuses one client"""
+    assert get_default_client() is get_default_client()
+
+def test_hibp_client_retries_server_errors(stub_server):
+    """Test that 429/5xx responses are retried before giving up"""
+    url, responses, paths = stub_server
+    password = "CompromisedPass123"
+    suffix = generate_sha1(password)[5:]
+    responses.extend([(503, "busy"), (429, "slow down"), (200, f"{suffix}:3")])
+
+    with HIBPClient(api_url=url, retries=3, backoff_factor=0) as client:
+        result = hibp_validator(password, client)
+
+    assert result.is_valid is False
+    assert paths == [f"/range/{generate_sha1(password)[:5]}"] * 3
+
+def test_hibp_client_gives_up_after_retries(stub_server):
+    """Test that persistent server errors surface as RuntimeError"""
+    url, responses, paths = stub_server
+    responses.append((500, "Internal Server Error"))
+
+    with HIBPClient(api_url=url, retries=2, backoff_factor=0) as client:
+        with pytest.raises(RuntimeError) as exc_info:
+            client.check("TestPassword123")
+
+    assert "Status: 500" in str(exc_info.value)
+    assert len(paths) == 3
+
+def test_hibp_check_many_fetches_each_prefix_once():
+    """Test that passwords sharing a prefix share one range request"""
+    breached = {"password", "qwerty"}
+    passwords = ["password", "Tr0ub4dor&3", "qwerty", "password", "correct horse", "qwerty"]
+    ranges = {}
+    for password in passwords:
+        sha1 = generate_sha1(password)
+        count = 5 if password in breached else 0
+        ranges.setdefault(sha1[:5], []).append(f"{sha1[5:]}:{count}")
+
+    fetched = []
+
+    def fetch_range(prefix):
+        fetched.append(prefix)
+        return "\r\n".join(ranges[prefix] + ["0000000000000000000000000000000000A:0"]).encode("ascii")
+
+    client = HIBPClient()
+    with patch.object(client, "fetch_range", side_effect=fetch_range):
+        results = hibp_check_many(passwords, client, max_in_flight=3)
+
+    assert [result.is_valid for result in results] == [False, True, False, False, True, False]
+    assert sorted(fetched) == sorted(ranges)
+
+def test_hibp_check_many_bounds_outstanding_requests():
+    """Test that ranges are submitted as earlier ones complete, not all up front"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    lock = threading.Lock()
+    outstanding = [0, 0]  # current, peak
+    submit = ThreadPoolExecutor.submit
+
+    def counting_submit(executor, fn, *args):
+        with lock:
+            outstanding[0] += 1
+            outstanding[1] = max(outstanding[1], outstanding[0])
+        future = submit(executor, fn, *args)
+
+        def finished(_):
+            with lock:
+                outstanding[0] -= 1
+        future.add_done_callback(finished)
+        return future
+
+    passwords = [f"candidate{i}" for i in range(500)]
+    client = HIBPClient()
+    with patch.object(ThreadPoolExecutor, "submit", counting_submit), \
+            patch.object(client, "range_suffixes", return_value=frozenset()) as range_suffixes:
+        results = hibp_check_many(passwords, client, max_in_flight=3)
+
+    assert all(result.is_valid for result in results)
+    assert range_suffixes.call_count == len({generate_sha1(password)[:5] for password in passwords})
+    assert outstanding[1] <= 6
+
+def test_hibp_check_many_api_error():
+    """Test that a failed range request fails the whole batch"""
+    client = HIBPClient()
+    with patch.object(client, "fetch_range", side_effect=Exception("Status: 500")):
+        with pytest.raises(RuntimeError) as exc_info:
+            hibp_check_many(["a", "b", "c"], client)
+
+    assert "HaveIBeenPwned check failed" in str(exc_info.value)
+
+def test_suffix_in_range():
+    """Test the byte-level range search"""
+    suffix = "1E4C9B93F3F0682250B6CF8331B7EE68FD8"
+    assert suffix_in_range(f"AAAA:1\r\n{suffix}:3\r\nBBBB:2".encode(), suffix) is True
+    assert suffix_in_range(f"{suffix}:3".encode(), suffix) is True
+    # Padding entries never count as breached
+    assert suffix_in_range(f"AAAA:1\r\n{suffix}:0\r\n".encode(), suffix) is False
+    # The suffix must be a whole field, not part of another one
+    assert suffix_in_range(f"X{suffix}:3\r\n{suffix}X:3".encode(), suffix) is False
+    assert suffix_in_range(b"", suffix) is False
@@ -0,0 +1,109 @@
+# tests\test_hibp_async.py
+import asyncio
+import gc
+import warnings
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from config import ValidationOptions
+from hibp import generate_sha1
+from hibp_async import AsyncHIBPClient, get_default_async_client, hibp_validator_async
+from hibp_cache import RangeCache
+from validator import validate_password_async
+
+
+def test_concurrent_checks_share_one_request(stub_server):
+    url, responses, paths = stub_server
+    password = "CompromisedPass123"
+    responses.append((200, f"{generate_sha1(password)[5:]}:7\r\nABCDEF:0"))
+
+    async def run():
+        async with AsyncHIBPClient(api_url=url) as client:
+            return await asyncio.gather(*(hibp_validator_async(password, client) for _ in range(10)))
+
+    results = asyncio.run(run())
+    assert [result.is_valid for result in results] == [False] * 10
+    assert len(paths) == 1
+
+
+def test_retries_and_cache(stub_server):
+    url, responses, paths = stub_server
+    responses.extend([(503, "busy"), (200, "ABCDEF:3")])
+
+    async def run():
+        async with AsyncHIBPClient(api_url=url, backoff_factor=0, cache=RangeCache()) as client:
+            first = await client.check("SafePassword123")
+            second = await client.check("SafePassword123")
+            return first, second
+
+    first, second = asyncio.run(run())
+    assert first.is_valid is True and second.is_valid is True
+    assert len(paths) == 2
+
+
+def test_gives_up_with_runtime_error(stub_server):
+    url, responses, paths = stub_server
+    responses.append((500, "Internal Server Error"))
+
+    async def run():
+        async with AsyncHIBPClient(api_url=url, retries=1, backoff_factor=0) as client:
+            await client.check("TestPassword123")
+
+    with pytest.raises(RuntimeError) as exc_info:
+        asyncio.run(run())
+    assert "HaveIBeenPwned check failed" in str(exc_info.value)
+    assert len(paths) == 2
+
+
+def test_validate_password_async_reports_local_and_breach_errors(stub_server):
+    url, responses, paths = stub_server
+    password = "password"
+    responses.append((200, f"{generate_sha1(password)[5:]}:100"))
+    options = ValidationOptions(minLength=10, blocklist=["password"], hibpCheck=True)
+
+    async def run():
+        async with AsyncHIBPClient(api_url=url) as client:
+            return await validate_password_async(password, options, client)
+
+    result = asyncio.run(run())
+    assert result.isValid is False
+    assert result.errors == [
+        "Password must be at least 10 characters long.",
+        'Password contains a substring too similar to: "password".',
+        "Password has been compromised in a data breach.",
+    ]
+
+
+def test_default_client_per_loop():
+    async def default():
+        return get_default_async_client()
+
+    async def same_loop_twice():
+        return await default() is await default()
+
+    assert asyncio.run(same_loop_twice()) is True
+    assert asyncio.run(default()) is not asyncio.run(default())
+
+
+def test_default_client_is_closed_with_its_loop(stub_server):
+    url, responses, paths = stub_server
+    responses.append((200, "ABCDEF:3"))
+    sessions = []
+
+    async def check():
+        client = get_default_async_client()
+        client.api_url = url
+        result = await client.check("SafePassword123")
+        sessions.append(client._session)
+        return result.is_valid
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ResourceWarning)
+        assert asyncio.run(check()) is True
+        assert asyncio.run(check()) is True
+        gc.collect()
+    assert [str(warning.message) for warning in caught if issubclass(warning.category, ResourceWarning)] == []
+    assert len(sessions) == 2 and all(session.closed for session in sessions)
+    assert len(paths) == 2
@@ -0,0 +1,72 @@
+# tests\test_hibp_cache.py
+from unittest.mock import patch, Mock
+
+from hibp import HIBPClient, generate_sha1
+from hibp_cache import RangeCache, parse_range
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_parse_range_skips_padding_and_malformed_lines():
+    body = b"AAAA:3\r\nBBBB:0\r\nmalformed\r\nCCCC:x\r\ndddd:1"
+    assert parse_range(body) == {"AAAA", "DDDD"}
+
+
+def test_hits_misses_and_ttl():
+    clock = FakeClock()
+    cache = RangeCache(ttl=60, clock=clock)
+    assert cache.get("ABCDE") is None
+    cache.put("ABCDE", frozenset({"X"}))
+    assert cache.get("ABCDE") == {"X"}
+
+    clock.now += 61
+    assert cache.get("ABCDE") is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "diskHits": 0, "hitRate": 1 / 3, "size": 0}
+
+
+def test_lru_eviction():
+    cache = RangeCache(max_entries=2)
+    cache.put("AAAAA", frozenset())
+    cache.put("BBBBB", frozenset())
+    cache.get("AAAAA")
+    cache.put("CCCCC", frozenset())
+    assert cache.get("BBBBB") is None
+    assert cache.get("AAAAA") is not None
+    assert len(cache) == 2
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "ranges.sqlite")
+    clock = FakeClock()
+    cache = RangeCache(disk_path=path, ttl=60, clock=clock)
+    cache.put("ABCDE", frozenset({"X", "Y"}))
+    cache.close()
+
+    restarted = RangeCache(disk_path=path, ttl=60, clock=clock)
+    assert restarted.get("ABCDE") == {"X", "Y"}
+    assert restarted.stats()["diskHits"] == 1
+
+    clock.now += 61
+    restarted.clear()
+    assert restarted.get("ABCDE") is None
+    restarted.close()
+
+
+def test_client_fetches_each_prefix_once():
+    password = "CompromisedPass123"
+    suffix = generate_sha1(password)[5:]
+    response = Mock(status_code=200, content=f"{suffix}:12\r\nABCDEF:0".encode("ascii"))
+    client = HIBPClient(cache=RangeCache())
+
+    with patch("requests.Session.get", return_value=response) as mock_get:
+        assert client.check(password).is_valid is False
+        assert client.check(password).is_valid is False
+
+    mock_get.assert_called_once()
+    assert client.cache.stats()["hits"] == 1
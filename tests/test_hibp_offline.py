@@ -0,0 +1,116 @@
+# tests\test_hibp_offline.py
+import asyncio
+import hashlib
+import pickle
+import pytest
+
+from config import ValidationOptions
+from hibp import hibp_validator
+from hibp_offline import OfflineHIBPStore, build_breach_filter, build_offline_store, get_offline_store
+from validator import validate_password, validate_password_async
+
+breached = ["password", "123456", "qwerty", "letmein", "00000"]
+
+
+def sha1(password: str) -> str:
+    return hashlib.sha1(password.encode("utf-8")).hexdigest().upper()
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    dump = tmp_path / "pwned-passwords-sha1-ordered-by-hash.txt"
+    lines = sorted(f"{sha1(password)}:{count}" for count, password in enumerate(breached, start=1))
+    dump.write_text("\r\n".join(lines) + "\r\n", encoding="ascii")
+    target = tmp_path / "pwned.bin"
+    assert build_offline_store(str(dump), str(target)) == len(breached)
+    return str(target)
+
+
+def test_breach_counts(store_path):
+    with OfflineHIBPStore(store_path) as store:
+        assert len(store) == len(breached)
+        for count, password in enumerate(breached, start=1):
+            assert store.breach_count(sha1(password)) == count
+        assert store.breach_count(sha1("correct horse battery staple")) == 0
+
+
+def test_same_results_as_online_path(store_path):
+    with OfflineHIBPStore(store_path) as store:
+        compromised = hibp_validator("qwerty", store)
+        assert compromised.is_valid is False
+        assert compromised.errors == ["Password has been compromised in a data breach."]
+        assert hibp_validator("Tr0ub4dor&3", store).is_valid is True
+
+
+def test_empty_store_is_not_replaced_by_online_client(tmp_path, monkeypatch):
+    dump = tmp_path / "empty.txt"
+    dump.write_text("", encoding="ascii")
+    target = tmp_path / "empty.bin"
+    assert build_offline_store(str(dump), str(target)) == 0
+
+    def online_client():
+        raise AssertionError("online client used")
+
+    monkeypatch.setattr("hibp.get_default_client", online_client)
+    with OfflineHIBPStore(str(target)) as store:
+        assert len(store) == 0
+        assert hibp_validator("qwerty", store).is_valid is True
+
+
+def test_selected_through_options(store_path):
+    options = ValidationOptions(hibpCheck=True, hibpOfflinePath=store_path)
+    assert validate_password("letmein", options).isValid is False
+    assert validate_password("Tr0ub4dor&3", options).isValid is True
+    assert get_offline_store(store_path) is get_offline_store(store_path)
+
+
+def test_pickled_options_keep_the_offline_store(store_path):
+    # Opened by compile(): dropped and resolved again from hibpOfflinePath
+    compiled = ValidationOptions(hibpCheck=True, hibpOfflinePath=store_path).compile()
+    assert compiled.hibpClient is get_offline_store(store_path)
+    restored = pickle.loads(pickle.dumps(compiled))
+    assert restored.hibpClient is None
+    assert validate_password("letmein", restored).isValid is False
+
+    # Passed by the caller: reopened from its path, never replaced by the online client
+    with OfflineHIBPStore(store_path) as store:
+        restored = pickle.loads(pickle.dumps(ValidationOptions(hibpCheck=True, hibpClient=store).compile()))
+    assert isinstance(restored.hibpClient, OfflineHIBPStore)
+    assert restored.hibpClient.path == store_path
+    assert validate_password("letmein", restored).isValid is False
+    restored.hibpClient.close()
+
+
+def test_async_validation_uses_the_configured_store(store_path):
+    with OfflineHIBPStore(store_path) as store:
+        options = ValidationOptions(hibpCheck=True, hibpClient=store)
+        assert asyncio.run(validate_password_async("letmein", options)).isValid is False
+        assert asyncio.run(validate_password_async("Tr0ub4dor&3", options)).isValid is True
+
+
+def test_rejects_unsorted_dump(tmp_path):
+    dump = tmp_path / "dump.txt"
+    dump.write_text("\n".join(sorted((sha1(p) for p in breached), reverse=True)), encoding="ascii")
+    with pytest.raises(ValueError):
+        build_offline_store(str(dump), str(tmp_path / "pwned.bin"))
+
+
+def test_rejects_foreign_file(tmp_path):
+    path = tmp_path / "not-a-store.bin"
+    path.write_bytes(b"not a store at all")
+    with pytest.raises(ValueError):
+        OfflineHIBPStore(str(path))
+
+
+def test_bloom_filter_front(store_path):
+    stats = build_breach_filter(store_path, false_positive_rate=0.001)
+    assert stats["entries"] == len(breached)
+
+    with OfflineHIBPStore(store_path) as store:
+        assert store.filter is not None
+        for password in breached:
+            assert store.check(password).is_valid is False
+        assert store.check("Tr0ub4dor&3").is_valid is True
+
+    with OfflineHIBPStore(store_path, use_filter=False) as store:
+        assert store.filter is None
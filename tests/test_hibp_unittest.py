@@ -10,13 +10,14 @@ class TestHIBPValidator(unittest.TestCase):
         expected_hash = "CC03E747A6AFBBCBF8BE7668ACFEBEE5"
         self.assertEqual(generate_sha1(password)[:32], expected_hash)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_password_is_compromised(self, mock_get):
         """Test when password is found in breach database"""
         # Mock response for a compromised password
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.text = "0123456789:42\r\nABCDEF:123"
+        mock_response.content = mock_response.text.encode("utf-8")
         mock_get.return_value = mock_response
 
         result = hibp_validator("test_password")
@@ -26,12 +27,13 @@ class TestHIBPValidator(unittest.TestCase):
             result.errors, ["Password has been compromised in a data breach."]
         )
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_password_is_safe(self, mock_get):
         """Test when password is not found in breach database"""
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.text = "DIFFERENTHASH:42\r\nANOTHERHASH:123"
+        mock_response.content = mock_response.text.encode("utf-8")
         mock_get.return_value = mock_response
 
         result = hibp_validator("safe_password123!")
@@ -39,12 +41,13 @@ class TestHIBPValidator(unittest.TestCase):
         self.assertTrue(result.is_valid)
         self.assertEqual(result.errors, [])
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_api_error(self, mock_get):
         """Test handling of API errors"""
         mock_response = Mock()
         mock_response.status_code = 500
         mock_response.text = "Internal Server Error"
+        mock_response.content = mock_response.text.encode("utf-8")
         mock_get.return_value = mock_response
 
         with self.assertRaises(RuntimeError) as context:
@@ -52,7 +55,7 @@ class TestHIBPValidator(unittest.TestCase):
 
         self.assertIn("HaveIBeenPwned check failed", str(context.exception))
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_network_error(self, mock_get):
         """Test handling of network errors"""
         mock_get.side_effect = Exception("Network error")
@@ -62,12 +65,13 @@ class TestHIBPValidator(unittest.TestCase):
 
         self.assertIn("HaveIBeenPwned check failed", str(context.exception))
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_empty_response(self, mock_get):
         """Test handling of empty API response"""
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.text = ""
+        mock_response.content = mock_response.text.encode("utf-8")
         mock_get.return_value = mock_response
 
         result = hibp_validator("test_password")
@@ -75,12 +79,13 @@ class TestHIBPValidator(unittest.TestCase):
         self.assertTrue(result.is_valid)
         self.assertEqual(result.errors, [])
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_malformed_response(self, mock_get):
         """Test handling of malformed API response"""
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.text = "malformed:data:format"  # Invalid format
+        mock_response.content = mock_response.text.encode("utf-8")
         mock_get.return_value = mock_response
 
         result = hibp_validator("test_password")
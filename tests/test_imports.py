@@ -0,0 +1,55 @@
+# tests\test_imports.py
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+
+# Heavy dependencies that must only load once a feature needing them is used
+DEFERRED = ("requests", "urllib3", "aiohttp", "numpy", "sqlite3", "multiprocessing")
+
+# Generous budget for a cold import of one module, dependencies included
+IMPORT_BUDGET_SECONDS = 0.5
+
+
+def cold_import(module: str) -> dict:
+    """Imports `module` in a fresh interpreter; returns the seconds it took and the deferred modules loaded."""
+    code = (
+        "import json, sys, time\n"
+        f"start = time.perf_counter()\nimport {module}\nelapsed = time.perf_counter() - start\n"
+        f"print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {DEFERRED!r} if m in sys.modules]}}))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=SRC, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+@pytest.mark.parametrize("module", ["blocklist_validator", "compiled_blocklist", "config", "validator", "batch", "hibp"])
+def test_import_defers_heavy_dependencies(module):
+    result = cold_import(module)
+    assert result["loaded"] == []
+    assert result["seconds"] < IMPORT_BUDGET_SECONDS
+
+
+def test_async_validation_with_an_offline_client_stays_offline():
+    code = (
+        "import asyncio, sys\n"
+        "from config import ValidationOptions\n"
+        "from validator import validate_password_async\n"
+        "class Store:\n"
+        "    def check(self, password):\n"
+        "        from hibp import ValidationResult\n"
+        "        return ValidationResult(is_valid=True, errors=[])\n"
+        "ValidationOptions(hibpCheck=True).compile()\n"
+        "options = ValidationOptions(hibpCheck=True, hibpClient=Store())\n"
+        "assert asyncio.run(validate_password_async('Tr0ub4dor&3', options)).isValid\n"
+        "print('requests' in sys.modules)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=SRC, check=True, capture_output=True, text=True
+    ).stdout
+    assert output.strip() == "False"
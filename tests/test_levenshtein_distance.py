@@ -0,0 +1,32 @@
+# tests\test_levenshtein_distance.py
+import itertools
+import pytest
+from utils.levenshtein_distance import levenshtein_distance, levenshtein_within
+
+
+def test_levenshtein_distance_known_values():
+    assert levenshtein_distance("kitten", "sitting") == 3
+    assert levenshtein_distance("", "abc") == 3
+    assert levenshtein_distance("abc", "abc") == 0
+
+
+@pytest.mark.parametrize("a, b, k, expected", [
+    ("kitten", "sitting", 3, True),
+    ("kitten", "sitting", 2, False),
+    ("password", "p@ssword", 1, True),
+    ("password", "p@ssw0rd", 1, False),
+    ("", "", 0, True),
+    ("abc", "", 2, False),
+    ("abc", "", 3, True),
+    ("abc", "abc", -1, False),
+])
+def test_levenshtein_within_known_values(a, b, k, expected):
+    assert levenshtein_within(a, b, k) is expected
+
+
+def test_levenshtein_within_agrees_with_full_distance():
+    words = ["".join(p) for n in range(5) for p in itertools.product("ab", repeat=n)]
+    for a, b in itertools.product(words, repeat=2):
+        distance = levenshtein_distance(a, b)
+        for k in range(4):
+            assert levenshtein_within(a, b, k) is (distance <= k)
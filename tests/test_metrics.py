@@ -0,0 +1,86 @@
+# tests\test_metrics.py
+import pytest
+
+from compiled_blocklist import CompiledBlocklist
+from config import ValidationOptions
+from hibp import HIBPClient, generate_sha1, hibp_validator
+from hibp_cache import RangeCache
+from metrics import InMemoryMetrics, MetricsHook, get_metrics_hook, set_metrics_hook
+from validator import validate_password
+
+
+@pytest.fixture
+def metrics():
+    """In-memory hook installed for the duration of a test"""
+    hook = InMemoryMetrics()
+    previous = set_metrics_hook(hook)
+    yield hook
+    set_metrics_hook(previous)
+
+
+def test_in_memory_aggregation():
+    hook = InMemoryMetrics()
+    hook.timing("stage.length", 0.5)
+    hook.timing("stage.length", 1.5)
+    hook.count("blocklist.termsScanned", 3)
+    hook.count("blocklist.termsScanned")
+
+    stats = hook.stats()
+    assert stats["timings"]["stage.length"] == {
+        "count": 2, "totalSeconds": 2.0, "meanSeconds": 1.0, "maxSeconds": 1.5
+    }
+    assert stats["counters"] == {"blocklist.termsScanned": 4}
+    assert hook.counter("missing") == 0
+
+    hook.reset()
+    assert hook.stats() == {"timings": {}, "counters": {}}
+
+
+def test_set_metrics_hook_returns_previous():
+    first, second = MetricsHook(), MetricsHook()
+    original = set_metrics_hook(first)
+    try:
+        assert get_metrics_hook() is first
+        assert set_metrics_hook(second) is first
+    finally:
+        set_metrics_hook(original)
+
+
+def test_validate_password_reports_stages_and_blocklist_counters(metrics):
+    options = ValidationOptions(minLength=8, blocklist=["password", "qwerty", "dragon"])
+    assert validate_password("password1", options).isValid is False
+
+    stats = metrics.stats()
+    assert {"stage.length", "stage.blocklist", "blocklist.check"} <= set(stats["timings"])
+    assert "stage.hibp" not in stats["timings"]
+
+    counters = stats["counters"]
+    assert counters["blocklist.termsScanned"] + counters["blocklist.termsPruned"] == 3
+    assert counters["blocklist.levenshteinCalls"] <= counters["blocklist.termsScanned"]
+
+
+def test_blocklist_validator_reports_compile_for_plain_lists(metrics):
+    from blocklist_validator import blocklist_validator
+
+    blocklist_validator("password", ["password"])
+    blocklist_validator("password", CompiledBlocklist(["password"]))
+    assert metrics.stats()["timings"]["blocklist.compile"]["count"] == 1
+    assert metrics.stats()["timings"]["blocklist.check"]["count"] == 2
+
+
+def test_hibp_reports_retries_and_cache(metrics, stub_server):
+    url, responses, paths = stub_server
+    password = "CompromisedPass123"
+    responses.extend([(503, "busy"), (200, f"{generate_sha1(password)[5:]}:3")])
+
+    with HIBPClient(api_url=url, backoff_factor=0, cache=RangeCache()) as client:
+        assert hibp_validator(password, client).is_valid is False
+        assert hibp_validator(password, client).is_valid is False
+
+    counters = metrics.stats()["counters"]
+    assert counters["hibp.requests"] == 1
+    assert counters["hibp.retries"] == 1
+    assert counters["hibp.cacheMisses"] == 1
+    assert counters["hibp.cacheHits"] == 1
+    assert {"hibp.check", "hibp.sha1", "hibp.lookup"} <= set(metrics.stats()["timings"])
+
@@ -0,0 +1,46 @@
+# tests\test_myers.py
+import itertools
+import pytest
+from utils.levenshtein_distance import levenshtein_distance
+from utils.myers import approximate_substring_within, pattern_bitmasks
+
+
+def best_substring_distance(text: str, pattern: str) -> int:
+    return min(
+        levenshtein_distance(text[i:j], pattern)
+        for i in range(len(text) + 1)
+        for j in range(i, len(text) + 1)
+    )
+
+
+def test_pattern_bitmasks():
+    assert pattern_bitmasks("abca") == {"a": 0b1001, "b": 0b0010, "c": 0b0100}
+
+
+@pytest.mark.parametrize("text, pattern, k, expected", [
+    ("mypassword123", "password", 0, True),
+    ("myp@ssword123", "password", 1, True),
+    ("myp@ssw0rd123", "password", 1, False),
+    ("passwrd", "password", 1, True),
+    ("", "password", 7, False),
+    ("", "password", 8, True),
+    ("パスワード123", "パスワード", 0, True),
+])
+def test_approximate_substring_within_known_values(text, pattern, k, expected):
+    assert approximate_substring_within(text, pattern, k) is expected
+
+
+def test_agrees_with_brute_force():
+    texts = ["".join(p) for n in range(6) for p in itertools.product("abc", repeat=n)][::7]
+    patterns = ["".join(p) for n in range(1, 4) for p in itertools.product("abc", repeat=n)]
+    for text, pattern in itertools.product(texts, patterns):
+        distance = best_substring_distance(text, pattern)
+        for k in range(3):
+            assert approximate_substring_within(text, pattern, k) is (distance <= k)
+
+
+def test_long_pattern_beyond_machine_word():
+    pattern = "ab" * 50
+    text = "xx" + pattern[:40] + "Z" + pattern[41:] + "yy"
+    assert approximate_substring_within(text, pattern, 1) is True
+    assert approximate_substring_within(text, pattern, 0) is False
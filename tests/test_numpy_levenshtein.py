@@ -0,0 +1,35 @@
+# tests\test_numpy_levenshtein.py
+import itertools
+import random
+import pytest
+from utils.levenshtein_distance import levenshtein_distance
+
+np = pytest.importorskip("numpy")
+
+from utils.numpy_levenshtein import batch_levenshtein, blocked_term_rows, encode, encode_terms
+
+
+def test_batch_levenshtein_agrees_with_pure_python():
+    rng = random.Random(7)
+    for len_a, len_b in [(0, 3), (3, 0), (1, 1), (4, 6), (6, 4), (8, 8)]:
+        pairs = [
+            ("".join(rng.choice("abc") for _ in range(len_a)), "".join(rng.choice("abc") for _ in range(len_b)))
+            for _ in range(50)
+        ]
+        a = np.array([[ord(c) for c in x] for x, _ in pairs], dtype=np.int32).reshape(50, len_a)
+        b = np.array([[ord(c) for c in y] for _, y in pairs], dtype=np.int32).reshape(50, len_b)
+        expected = [levenshtein_distance(x, y) for x, y in pairs]
+        assert batch_levenshtein(a, b).tolist() == expected
+
+
+def test_blocked_term_rows():
+    terms = encode_terms(["password", "p@ssw0rd", "drowssap"], 8)
+    assert blocked_term_rows(terms, encode("mypassw0rd1"), 1).tolist() == [0, 1]
+    assert blocked_term_rows(terms, encode("short"), 4).tolist() == []
+
+
+def test_blocked_term_rows_in_several_batches(monkeypatch):
+    monkeypatch.setattr("utils.numpy_levenshtein.MAX_PAIRS_PER_BATCH", 3)
+    words = ["".join(p) for p in itertools.product("ab", repeat=3)]
+    rows = blocked_term_rows(encode_terms(words, 3), encode("xaabx"), 0).tolist()
+    assert rows == [words.index("aab")]
@@ -0,0 +1,26 @@
+# tests\test_qgram_index.py
+import pytest
+from utils.qgram_index import QGramIndex, qgram_lower_bound, qgrams
+
+
+def test_qgrams():
+    assert qgrams("aaab", 2) == {"aa": 2, "ab": 1}
+    assert qgrams("a", 2) == {}
+
+
+def test_qgram_lower_bound():
+    assert qgram_lower_bound(8, 2, 2) == 3
+    assert qgram_lower_bound(8, 0, 3) == 6
+    assert qgram_lower_bound(3, 2, 2) <= 0
+
+
+def test_shared_counts_is_multiset_intersection():
+    index = QGramIndex(["password", "aaaa", "zz"])
+    assert index.shared_counts("mypassword") == {0: 7}
+    assert index.shared_counts("aa") == {1: 1}
+    assert index.shared_counts("aaaaaa") == {1: 3}
+
+
+def test_invalid_q():
+    with pytest.raises(ValueError):
+        QGramIndex(["password"], 0)
@@ -0,0 +1,174 @@
+# tests\test_result_cache.py
+import asyncio
+
+import pytest
+
+from config import ValidationOptions
+from result_cache import ResultCache
+from validator import DEFAULT_STAGES, CheckStage, validate_password, validate_password_async
+
+BREACHED = "Password has been compromised in a data breach."
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def pipeline():
+    """Default pipeline with a recording fake in place of the network check"""
+    calls = []
+
+    def record(password, options):
+        calls.append(password)
+        return [BREACHED] if password == "breached" else []
+
+    stages = tuple(stage._replace(run=record, run_async=None) if stage.name == "hibp" else stage for stage in DEFAULT_STAGES)
+    return stages, calls
+
+
+def test_repeated_passwords_are_answered_from_cache(pipeline):
+    stages, calls = pipeline
+    cache = ResultCache()
+    options = ValidationOptions(minLength=8, blocklist=["password"], hibpCheck=True)
+
+    first = validate_password("password1", options, stages, cache)
+    first.errors.append("mutated by the caller")
+    second = validate_password("password1", options, stages, cache)
+
+    assert calls == ["password1"]
+    assert second.isValid is False
+    assert second.errors == ['Password contains a substring too similar to: "password".']
+    assert cache.stats() == {"hits": 1, "misses": 1, "hitRate": 0.5, "invalidations": 0, "size": 1}
+
+
+def test_no_plaintext_is_stored():
+    cache = ResultCache()
+    validate_password("hunter2hunter2", ValidationOptions(minLength=8), cache=cache)
+    (key, entry), = cache._entries.items()
+    assert "hunter2hunter2" not in repr(key) + repr(entry)
+    assert b"hunter2hunter2" not in key[1]
+
+
+def test_options_and_stages_are_part_of_the_key(pipeline):
+    stages, calls = pipeline
+    cache = ResultCache()
+    validate_password("breached", ValidationOptions(hibpCheck=True), stages, cache)
+    validate_password("breached", ValidationOptions(hibpCheck=True, minLength=4), stages, cache)
+    validate_password("breached", ValidationOptions(hibpCheck=True), DEFAULT_STAGES[:2], cache)
+    assert calls == ["breached", "breached"]
+    assert len(cache) == 3
+
+
+def test_hibp_results_expire(pipeline):
+    stages, calls = pipeline
+    clock = FakeClock()
+    cache = ResultCache(hibp_ttl=60, clock=clock)
+    with_hibp = ValidationOptions(hibpCheck=True)
+    without_hibp = ValidationOptions(minLength=8)
+
+    validate_password("breached", with_hibp, stages, cache)
+    validate_password("short", without_hibp, stages, cache)
+    clock.now = 61
+    assert validate_password("breached", with_hibp, stages, cache).isValid is False
+    validate_password("short", without_hibp, stages, cache)
+
+    assert calls == ["breached", "breached"]
+    assert cache.stats()["hits"] == 1
+
+
+def test_blocklist_updates_clear_entries():
+    cache = ResultCache()
+    options = ValidationOptions(blocklist=["password"]).compile()
+    assert validate_password("dragon1", options, cache=cache).isValid is True
+
+    options.blocklist.add(["dragon"])
+    assert validate_password("dragon1", options, cache=cache).isValid is False
+    assert cache.stats()["invalidations"] == 1
+    assert validate_password("dragon1", options, cache=cache).isValid is False
+    assert cache.stats()["hits"] == 1
+
+
+def test_result_computed_during_an_update_is_not_served():
+    from compiled_blocklist import CompiledBlocklist
+
+    cache = ResultCache()
+    # A blocklist of its own, as compiled options from lists are shared process-wide
+    options = ValidationOptions(blocklist=CompiledBlocklist(["password"])).compile()
+
+    key = cache.key("dragon1", options)
+    stale = validate_password("dragon1", options)
+    options.blocklist.add(["dragon"])  # Lands before the result is stored
+    assert cache.get(cache.key("dragon1", options)) is None
+    cache.put(key, stale)
+
+    assert cache.get(cache.key("dragon1", options)) is None
+    assert cache.stats()["invalidations"] == 1
+    assert validate_password("dragon1", options, cache=cache).isValid is False
+
+
+def test_evicted_policies_are_released():
+    import gc
+    import weakref
+
+    from compiled_blocklist import CompiledBlocklist
+    from config import clear_compiled_options
+
+    cache = ResultCache(max_entries=4)
+    blocklist = CompiledBlocklist(["password"])
+    released = weakref.ref(blocklist)
+    validate_password("password1", ValidationOptions(blocklist=blocklist), cache=cache)
+    del blocklist
+    for length in range(10):
+        validate_password("password1", ValidationOptions(minLength=length), cache=cache)
+    clear_compiled_options()
+    gc.collect()
+    assert released() is None
+
+
+def test_lru_bound():
+    cache = ResultCache(max_entries=2)
+    options = ValidationOptions(minLength=8)
+    for password in ["one", "two", "one", "three"]:
+        validate_password(password, options, cache=cache)
+    assert len(cache) == 2
+    validate_password("one", options, cache=cache)
+    assert cache.stats()["hits"] == 2
+
+    cache.clear()
+    assert cache.stats() == {"hits": 0, "misses": 0, "hitRate": 0.0, "invalidations": 0, "size": 0}
+
+
+def test_failed_validations_are_not_cached():
+    def flaky(password, options):
+        raise RuntimeError("HaveIBeenPwned check failed: timeout")
+
+    cache = ResultCache()
+    stages = (CheckStage("hibp", 1000, lambda options: True, flaky),)
+    with pytest.raises(RuntimeError):
+        validate_password("anything", ValidationOptions(), stages, cache)
+    assert len(cache) == 0
+
+
+def test_async_validation_uses_cache(pipeline):
+    stages, calls = pipeline
+    cache = ResultCache()
+    options = ValidationOptions(hibpCheck=True)
+
+    async def run():
+        first = await validate_password_async("breached", options, stages=stages, cache=cache)
+        second = await validate_password_async("breached", options, stages=stages, cache=cache)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.errors == second.errors == [BREACHED]
+    assert calls == ["breached"]
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        ResultCache(max_entries=0)
@@ -0,0 +1,41 @@
+# tests\test_term_store.py
+import gzip
+import pytest
+from utils.term_store import TermStore, read_lines
+
+
+def test_packs_terms_by_length_without_duplicates():
+    store = TermStore.from_terms(["password", "abc", "qwerty", "abc", "letmein1", "pässwört"])
+    assert list(store) == ["abc", "qwerty", "password", "letmein1", "pässwört"]
+    assert len(store) == 5
+    assert store.runs() == ((3, 0, 1), (6, 1, 2), (8, 2, 5))
+
+
+def test_indexing_and_slicing():
+    store = TermStore.from_terms(["bb", "a", "cc"])
+    assert store[0] == "a"
+    assert store[-1] == "cc"
+    assert store[1:] == ["bb", "cc"]
+    with pytest.raises(IndexError):
+        store[3]
+
+
+def test_nbytes_is_smaller_than_str_objects():
+    terms = [f"password{i}" for i in range(1000)]
+    store = TermStore.from_terms(terms)
+    assert store.nbytes() < sum(len(term) for term in terms) + 8 * (len(terms) + 1)
+
+
+def test_empty_store():
+    store = TermStore.from_terms([])
+    assert len(store) == 0
+    assert list(store) == []
+    assert store.runs() == ()
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_read_lines(tmp_path, compressed):
+    path = tmp_path / "terms.txt"
+    content = "password\r\nqwerty\n\nlast".encode("utf-8")
+    path.write_bytes(gzip.compress(content) if compressed else content)
+    assert list(read_lines(str(path))) == ["password", "qwerty", "", "last"]
@@ -0,0 +1,71 @@
+# tests\test_validator.py
+import pytest
+from unittest.mock import patch
+
+from config import ValidationOptions
+from validator import DEFAULT_STAGES, CheckStage, validate_password
+
+BREACHED = "Password has been compromised in a data breach."
+
+
+def fake_hibp(password, options):
+    return [BREACHED]
+
+
+@pytest.fixture
+def stages():
+    """Default pipeline with the network check replaced by a recording fake"""
+    calls = []
+
+    def record(password, options):
+        calls.append(password)
+        return fake_hibp(password, options)
+
+    pipeline = [stage._replace(run=record) if stage.name == "hibp" else stage for stage in DEFAULT_STAGES]
+    return pipeline, calls
+
+
+def test_full_report_runs_every_stage(stages):
+    pipeline, calls = stages
+    options = ValidationOptions(minLength=10, blocklist=["password"], hibpCheck=True)
+    result = validate_password("password", options, pipeline)
+    assert result.isValid is False
+    assert result.errors == [
+        "Password must be at least 10 characters long.",
+        'Password contains a substring too similar to: "password".',
+        BREACHED,
+    ]
+    assert calls == ["password"]
+
+
+def test_fail_fast_skips_expensive_stages(stages):
+    pipeline, calls = stages
+    options = ValidationOptions(minLength=10, blocklist=["password"], hibpCheck=True, failFast=True)
+    result = validate_password("password", options, pipeline)
+    assert result.errors == ["Password must be at least 10 characters long."]
+    assert calls == []
+
+
+def test_error_limit_stops_pipeline(stages):
+    pipeline, calls = stages
+    options = ValidationOptions(blocklist=["password", "word", "pass"], hibpCheck=True, errorLimit=2)
+    result = validate_password("password", options, pipeline)
+    assert len(result.errors) == 2
+    assert calls == []
+
+
+def test_stages_run_cheapest_first():
+    order = []
+    pipeline = [
+        CheckStage("slow", 50, lambda options: True, lambda password, options: order.append("slow") or []),
+        CheckStage("fast", 5, lambda options: True, lambda password, options: order.append("fast") or []),
+    ]
+    assert validate_password("anything", ValidationOptions(), pipeline).isValid is True
+    assert order == ["fast", "slow"]
+
+
+def test_disabled_stages_do_not_run():
+    with patch("hibp.hibp_validator") as mock_hibp:
+        result = validate_password("Tr0ub4dor&3", ValidationOptions(minLength=8, blocklist=["password"]))
+    assert result.isValid is True
+    mock_hibp.assert_not_called()